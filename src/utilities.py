@@ -10,18 +10,46 @@ In total the following different Utilities classes are provided:
 
 '''
 from os.path import isdir, join
-from os import makedirs
+from os import PathLike, makedirs
 import logging
-from sys import stdout
-from random import random
+from sys import stdout, getsizeof
+from random import random, uniform
 import time
-from functools import wraps
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping, MutableSequence
+from functools import wraps, partial
+from io import BytesIO, IOBase
+from itertools import chain, islice, repeat
+from operator import attrgetter, not_
+from reprlib import Repr
+from threading import Event, Lock, Thread, current_thread, get_ident, local
+from weakref import ref
 
 '''
 Contains:
 - Logger
+- BoundedQueueHandler
+- BufferedRotatingFileHandler
+- JsonFormatter
+- MetricsRegistry
+    - CounterMetric
+    - GaugeMetric
+    - LatencyHistogram
+- FunctionProfiler
+- CircuitBreaker
+- RetryPolicy
+- LogSampler
+- MemoizeCache
+- DiskCache
+- ArgumentRepr
+- ArgumentValidator
+- WrapperFusion
 - Decorator
     - run_time
+    - profile
+    - memoize
+    - disk_cache
     - show_args
     - counter
     - retry
@@ -29,435 +57,3615 @@ Contains:
     - accepted_args
     - accepted_args_classes
     - accepted_args_type
+    - validate
     - container_non_empty
     - class_has_object
+    - compose
+    - parallel_map
 - Dict_to_Obj
+- Dict_View
+    - List_View
 - Class Attribute Handler
 '''
 
 
+_CO_COROUTINE = 0x0080
 
-class Decorators:
+
+def iscoroutinefunction(func):
     """
-    This class provides a set of functionality with respect to decorate functions. These decorators are considered
-    util as they prevent to repeat the same code, add functionality to a function on the fly, allows a lot of type
-    and input checking and so on.
+    Returns True if ``func`` is a coroutine function, as ``inspect.iscoroutinefunction`` does. Plain functions and
+    methods are checked by the flags of their code object, so ``inspect``, one of the slowest imports of the module,
+    is only imported for other callables such as partial objects.
+    """
+    function = getattr(func, '__func__', func)
+    code = getattr(function, '__code__', None)
+    if code is None or isinstance(func, partial) or hasattr(function, '_is_coroutine_marker'):
+        from inspect import iscoroutinefunction as inspect_iscoroutinefunction
+        return inspect_iscoroutinefunction(func)
+    return bool(code.co_flags & _CO_COROUTINE)
+
+
+class FunctionNotExecutedError(Exception):
+    '''
+    Raised by the retry decorators if a function could not be executed successfully.
+    '''
+
+
+class CircuitOpenError(FunctionNotExecutedError):
+    '''
+    Raised by the retry decorators if the circuit breaker of the called target is open.
+    '''
+
+
+class DeadlineExceededError(FunctionNotExecutedError):
+    '''
+    Raised by the retry decorators if the deadline budget of a call does not allow another try. It is raised by both
+    decorators, also by ``Decorators.retry`` which otherwise returns None after the last failed try, and is chained to
+    the exception of the last try.
+    '''
+
+
+class ParallelMapError(Exception):
+    '''
+    Raised by functions decorated by ``Decorators.parallel_map`` after the results of the other items if items failed.
+    ``errors`` holds the index, the item and the exception of every failed item.
+    '''
+
+    def __init__(self, errors):
+        index, item, error = errors[0]
+        super().__init__(f'{len(errors)} of the items failed, the first one is item {index} ({item!r}): {error!r}')
+        self.errors = errors
+
+
+class _ShardedMetric(ABC):
+    """
+    Base class of metrics which are updated on hot paths. Every thread accumulates into its own shard so that an
+    update neither takes a lock nor loses increments under concurrency. Reading a metric merges all shards. Shards of
+    finished threads are folded into a retired shard to bound memory when threads come and go.
+
+    Subclasses define the value of a new shard and how a shard is merged into another one.
+    """
+
+    TYPE = 'untyped'
+
+    def __init__(self, name, documentation='', labels=None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = dict(labels or {})
+        self._local = local()
+        self._lock = Lock()
+        self._shards = []
+        self._retired = self._new_shard_value()
+
+    @abstractmethod
+    def _new_shard_value(self):
+        """
+        Returns the value of a new (empty) shard.
+        """
+
+    @abstractmethod
+    def _merge_into(self, target, shard):
+        """
+        Adds the values of ``shard`` to ``target`` in place.
+        """
+
+    def _shard(self):
+        """
+        Returns the shard of the calling thread and creates it upon the thread's first update.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._new_shard_value()
+            with self._lock:
+                self._shards.append((shard, ref(current_thread())))
+            return shard
+
+    def _live_shards(self) -> list:
+        """
+        Returns the retired shard followed by the shards of all running threads.
+        """
+        with self._lock:
+            alive = []
+            for shard, thread in self._shards:
+                thread = thread()
+                if thread is None or not thread.is_alive():
+                    self._merge_into(self._retired, shard)
+                else:
+                    alive.append((shard, ref(thread)))
+            self._shards = alive
+            return [self._retired] + [shard for shard, _ in alive]
+
+
+class CounterMetric(_ShardedMetric):
+    """
+    A monotonically increasing counter, e.g. the number of calls of a function.
+    """
+
+    TYPE = 'counter'
+
+    def _new_shard_value(self):
+        return [0]
+
+    def _merge_into(self, target, shard):
+        target[0] += shard[0]
+
+    def inc(self, amount=1):
+        """
+        Increments the counter of the calling thread.
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[0] += amount
+
+    @property
+    def value(self):
+        return sum(shard[0] for shard in self._live_shards())
+
+    def reset(self):
+        for shard in self._live_shards():
+            shard[0] = 0
+
+    def samples(self) -> list:
+        """
+        Returns the samples of the metric as (suffix, extra labels, value) tuples used by the text exposition.
+        """
+        return [('', {}, self.value)]
+
+
+class GaugeMetric:
+    """
+    A value which can go up and down, e.g. the size of a queue. Gauges are not sharded as they are usually set
+    rather than incremented on hot paths.
+    """
+
+    TYPE = 'gauge'
+
+    def __init__(self, name, documentation='', labels=None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = dict(labels or {})
+        self._lock = Lock()
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def reset(self):
+        self.value = 0
+
+    def samples(self) -> list:
+        return [('', {}, self.value)]
+
+
+class LatencyHistogram(_ShardedMetric):
+    """
+    This class records durations (in nanoseconds) into logarithmic buckets in the style of a HDR histogram.
+    Each power of two is split into a fixed number of linear sub buckets, so recording a value is a couple of integer
+    operations and a dictionary update while quantiles keep a relative error below 1%.
+    It is used by ``Decorators.run_time`` to aggregate the latency of hot functions instead of logging every call.
+    The text exposition exports the histogram as a summary in seconds.
+
+    Example::
+
+    > 1 hist = LatencyHistogram('foo')
+    > 2 hist.record(1500)
+    > 3 hist.summary()
+    > # returns {'count': 1, 'mean': 1500.0, 'p50': 1500, 'p95': 1500, 'p99': 1500, 'max': 1500}
+    """
+
+    TYPE = 'summary'
+    SUB_BUCKET_BITS = 7
+
+    def _new_shard_value(self):
+        # bucket counts, count, total, max
+        return [{}, 0, 0, 0]
+
+    def _merge_into(self, target, shard):
+        counts = target[0]
+        for index, bucket_count in shard[0].copy().items():
+            counts[index] = counts.get(index, 0) + bucket_count
+        target[1] += shard[1]
+        target[2] += shard[2]
+        target[3] = max(target[3], shard[3])
+
+    @classmethod
+    def _bucket_index(cls, value):
+        """
+        Returns the index of the bucket a value belongs to. Values below 2**SUB_BUCKET_BITS are stored exactly.
+        """
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return (shift << (cls.SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @classmethod
+    def _bucket_value(cls, index):
+        """
+        Returns the value represented by a bucket, i.e. the midpoint of the bucket's range.
+        """
+        if index < 1 << cls.SUB_BUCKET_BITS:
+            return index
+        shift = (index >> (cls.SUB_BUCKET_BITS - 1)) - 1
+        mantissa = index - (shift << (cls.SUB_BUCKET_BITS - 1))
+        return (mantissa << shift) + (1 << (shift - 1))
+
+    def record(self, value):
+        """
+        Records a single duration into the shard of the calling thread.
+
+        :param value: duration in nanoseconds
+        :type value: int
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        index = self._bucket_index(value)
+        counts = shard[0]
+        counts[index] = counts.get(index, 0) + 1
+        shard[1] += 1
+        shard[2] += value
+        if value > shard[3]:
+            shard[3] = value
+
+    def reset(self):
+        """
+        Drops all recorded values.
+        """
+        for shard in self._live_shards():
+            shard[:] = self._new_shard_value()
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)) -> dict:
+        """
+        Returns the number of recorded values, their mean, the requested quantiles and the maximum (all in nanoseconds).
+
+        :param quantiles: quantiles to compute, each between 0 and 1
+        :type quantiles: tuple
+        :return: a dictionary with the keys count, mean, p50, p95, p99 and max
+        :rtype: dict
+        """
+        merged = self._new_shard_value()
+        for shard in self._live_shards():
+            self._merge_into(merged, shard)
+        counts, count, total, maximum = sorted(merged[0].items()), merged[1], merged[2], merged[3]
+        summary = {'count': count, 'mean': total / count if count else 0.0}
+        for q in quantiles:
+            rank, seen, value = q * count, 0, 0
+            for index, bucket_count in counts:
+                seen += bucket_count
+                value = self._bucket_value(index)
+                if seen >= rank:
+                    break
+            summary[f'p{q * 100:g}'] = min(value, maximum)
+        summary['max'] = maximum
+        summary['sum'] = total
+        return summary
+
+    def report(self) -> str:
+        """
+        Logs the current summary of the histogram with a human readable time unit and returns the logged message.
+        """
+        summary = self.summary()
+        parts = ', '.join(
+            f'{key}={self._format_ns(value)}' for key, value in summary.items() if key not in ('count', 'sum')
+        )
+        function = self.labels.get("function", self.name)
+        message = f'Latency of "{function}" over {summary["count"]} calls: {parts}'
+        log.info(message, extra={'function': function, 'latency_ns': summary})
+        return message
+
+    def samples(self) -> list:
+        summary = self.summary()
+        samples = [
+            ('', {'quantile': str(q)}, summary[f'p{q * 100:g}'] / 1e9) for q in (0.5, 0.95, 0.99)
+        ]
+        samples.append(('_sum', {}, summary['sum'] / 1e9))
+        samples.append(('_count', {}, summary['count']))
+        return samples
+
+    @staticmethod
+    def _format_ns(value):
+        for unit, scale in (('s', 1e9), ('ms', 1e6), ('µs', 1e3)):
+            if value >= scale:
+                return f'{value / scale:.3f}{unit}'
+        return f'{value:.0f}ns'
+
+
+class MetricsRegistry:
+    """
+    This class holds the counters, gauges and latency histograms of a process. The decorators ``counter`` and
+    ``run_time`` register their metrics in the module wide registry ``metrics``.
+    All metrics can be exported in the Prometheus text format, either periodically into a file (e.g. for the
+    node_exporter textfile collector) or via a local HTTP endpoint.
+
+    Example::
+
+    > 1 from utilities import metrics
+    > 2 requests = metrics.counter('requests_total', 'Number of handled requests', labels={'handler': 'index'})
+    > 3 requests.inc()
+    > 4 metrics.start_textfile_exporter('/var/lib/node_exporter/app.prom', interval=15)
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._metrics = {}
+        self._stop = Event()
+
+    def _get_or_create(self, metric_class, name, documentation, labels):
+        key = (name, tuple(sorted((labels or {}).items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = metric_class(name, documentation, labels)
+        if not isinstance(metric, metric_class):
+            raise ValueError(f'Metric "{name}" is already registered as {metric.TYPE}')
+        return metric
+
+    def counter(self, name, documentation='', labels=None) -> CounterMetric:
+        """
+        Returns the counter with the given name and labels. It is created if it does not exist yet.
+        """
+        return self._get_or_create(CounterMetric, name, documentation, labels)
+
+    def gauge(self, name, documentation='', labels=None) -> GaugeMetric:
+        """
+        Returns the gauge with the given name and labels. It is created if it does not exist yet.
+        """
+        return self._get_or_create(GaugeMetric, name, documentation, labels)
+
+    def histogram(self, name, documentation='', labels=None) -> LatencyHistogram:
+        """
+        Returns the latency histogram with the given name and labels. It is created if it does not exist yet.
+        """
+        return self._get_or_create(LatencyHistogram, name, documentation, labels)
+
+    def clear(self):
+        """
+        Removes all metrics from the registry.
+        """
+        with self._lock:
+            self._metrics = {}
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ''
+        escaped = (
+            (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, value in labels.items()
+        )
+        return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+    def exposition(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines, described = [], set()
+        for (name, _), metric in metrics:
+            if name not in described:
+                described.add(name)
+                if metric.documentation:
+                    lines.append(f'# HELP {name} {metric.documentation}')
+                lines.append(f'# TYPE {name} {metric.TYPE}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{name}{suffix}{self._format_labels({**metric.labels, **labels})} {value}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_textfile(self, path):
+        """
+        Writes the exposition into a file. The file is replaced atomically so that readers never see partial content.
+        """
+        from os import replace
+        temp_path = f'{path}.{get_ident()}.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(self.exposition())
+        replace(temp_path, path)
+
+    def start_textfile_exporter(self, path, interval=15.0) -> Thread:
+        """
+        Starts a background thread which writes the exposition into a file every ``interval`` seconds and once more
+        when the exporters are stopped.
+
+        :param path: file the metrics are written to
+        :param interval: seconds between two exports
+        :type interval: float
+        :return: the exporting thread
+        """
+        def export():
+            while not self._stop.wait(interval):
+                self.write_textfile(path)
+            self.write_textfile(path)
+
+        self._stop.clear()
+        thread = Thread(target=export, name='metrics-textfile-exporter', daemon=True)
+        thread.start()
+        return thread
+
+    def start_http_server(self, port=9100, address='127.0.0.1'):
+        """
+        Serves the exposition via HTTP from a background thread.
+
+        :param port: port to listen on. Use 0 to pick a free port.
+        :type port: int
+        :param address: address to bind to. Defaults to the local interface only.
+        :type address: str
+        :return: the server. Its ``server_address`` contains the bound port and ``shutdown()`` stops it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.exposition().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((address, port), MetricsHandler)
+        server.daemon_threads = True
+        Thread(target=server.serve_forever, name='metrics-http-server', daemon=True).start()
+        return server
+
+    def stop_exporters(self):
+        """
+        Stops all textfile exporters after a final export.
+        """
+        self._stop.set()
+
+
+metrics = MetricsRegistry()
+
+
+class FunctionProfiler:
+    """
+    This class collects call-graph profiles of a single function across all of its calls. It is used by
+    ``Decorators.profile`` and supports two modes:
+     - deterministic: every call is traced by ``cProfile``. Each thread uses its own profile which are merged on export.
+       From Python 3.12 on, cProfile is based on ``sys.monitoring`` and only one profile can be active per process,
+       which records all threads. There, a single profile is enabled while any thread is inside the function, so calls
+       of other threads running at the same time are part of the profile as well. If another profiler is already active
+       (e.g. the one of an enclosing profiled function), the calls are not profiled separately but are part of the
+       other profile.
+     - sampling: a background thread looks at the stacks of all threads which are currently inside the function every
+       ``sample_interval`` seconds. The overhead on the call path is a dictionary update per call. The thread is
+       started once and waits while no call is in flight.
+
+    The aggregated profile can be written as a ``.pstats`` file (both modes) which can be read by ``pstats`` or
+    snakeviz, or as a collapsed stack text file (sampling mode) which can be rendered by flamegraph.pl or speedscope.
+    """
+
+    MODES = ('deterministic', 'sampling')
+
+    def __init__(self, func, mode='deterministic', sample_interval=0.001):
+        if mode not in self.MODES:
+            raise ValueError(f'Unknown profiling mode "{mode}". Valid modes are: {self.MODES}')
+        self.func = func
+        self.name = func.__qualname__
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.calls = 0
+        self.samples = 0
+        self._lock = Lock()
+        self._active = {}
+        self._profiles = {}
+        self._stacks = {}
+        self._sampler = None
+        self._in_flight = Event()
+        self._warned = False
+        # keys of the profiles which were enabled again for the calls still running when the enabling call returned
+        self._handed_over = set()
+        import sys
+        self._per_thread = not hasattr(sys, 'monitoring')
+
+    def enter(self):
+        """
+        Marks the current thread as being inside the profiled function. In the deterministic mode, returns the cProfile
+        profile which the caller enables right before calling the function and disables right after it (before calling
+        ``exit``), such that the profiler's own bookkeeping is not part of the profile. Returns None if nothing has to
+        be enabled: for nested calls, in the sampling mode and if another profiler is already active in the thread
+        (e.g. the one of an enclosing profiled function), whose profile then includes this call.
+        """
+        thread_id = get_ident()
+        with self._lock:
+            depth = self._active.get(thread_id, 0)
+            self._active[thread_id] = depth + 1
+            self.calls += 1
+            if depth:
+                return None
+            if self.mode == 'sampling':
+                if not self._in_flight.is_set():
+                    self._in_flight.set()
+                if self._sampler is None:
+                    self._sampler = Thread(target=self._sample, name=f'profiler-{self.name}', daemon=True)
+                    self._sampler.start()
+                return None
+            if not self._per_thread and len(self._active) > 1:
+                # the shared profile is already enabled by another thread
+                return None
+            if self._other_profiler_active():
+                if not self._warned:
+                    self._warned = True
+                    log.warning(f'Could not profile "{self.name}" as another profiler is already active. Its calls are '
+                                f'part of that profile.')
+                return None
+            if self._per_thread:
+                return self._profile(thread_id)
+            return self._profile(0)
+
+    @staticmethod
+    def _other_profiler_active() -> bool:
+        import sys
+        if hasattr(sys, 'monitoring'):
+            return sys.monitoring.get_tool(sys.monitoring.PROFILER_ID) is not None
+        return sys.getprofile() is not None
+
+    def _profile(self, key):
+        profile = self._profiles.get(key)
+        if profile is None:
+            import cProfile
+            profile = self._profiles[key] = cProfile.Profile()
+        return profile
+
+    def exit(self, profile=None):
+        """
+        Marks the current thread as having left the profiled function. ``profile`` is the one ``enter`` returned for
+        this call, after the caller disabled it. If other calls covered by the profile are still running (calls of other
+        threads from Python 3.12 on, or interleaved calls of a coroutine function), it is enabled again for them and
+        disabled when the last one of them leaves.
+        """
+        thread_id = get_ident()
+        with self._lock:
+            depth = self._active[thread_id] - 1
+            if depth:
+                self._active[thread_id] = depth
+            else:
+                del self._active[thread_id]
+            if self.mode == 'sampling':
+                return
+            key, remaining = (thread_id, depth) if self._per_thread else (0, len(self._active))
+            if profile is not None:
+                if remaining:
+                    try:
+                        profile.enable()
+                        self._handed_over.add(key)
+                    except ValueError:
+                        # another profiler started in the meantime
+                        pass
+            elif not remaining and key in self._handed_over:
+                self._handed_over.discard(key)
+                self._profiles[key].disable()
+
+    def _sample(self):
+        """
+        Body of the sampling thread. It records the stacks of all threads inside the function and waits while there
+        is none.
+        """
+        from sys import _current_frames
+        code = self.func.__code__
+        while True:
+            self._in_flight.wait()
+            time.sleep(self.sample_interval)
+            with self._lock:
+                if not self._active:
+                    self._in_flight.clear()
+                    continue
+                thread_ids = list(self._active)
+            frames = _current_frames()
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    frame_code = frame.f_code
+                    stack.append((frame_code.co_filename, frame_code.co_firstlineno, frame_code.co_name))
+                    if frame_code is code:
+                        break
+                    frame = frame.f_back
+                if frame is None:
+                    # the thread has not yet entered or already left the function
+                    continue
+                stack = tuple(reversed(stack))
+                with self._lock:
+                    self._stacks[stack] = self._stacks.get(stack, 0) + 1
+                    self.samples += 1
+
+    def reset(self):
+        """
+        Drops all collected profiling data.
+        """
+        with self._lock:
+            self.calls = self.samples = 0
+            self._stacks = {}
+            for profile in self._profiles.values():
+                profile.clear()
+
+    def _raw_stats(self) -> dict:
+        """
+        Returns the profile in the ``pstats`` raw format, i.e. a mapping of (file, line, function) to
+        (primitive calls, calls, total time, cumulative time, callers).
+        """
+        if self.mode == 'deterministic':
+            merged = {}
+            with self._lock:
+                profiles = list(self._profiles.values())
+            for profile in profiles:
+                profile.snapshot_stats()
+                for key, (cc, nc, tt, ct, callers) in profile.stats.items():
+                    if key not in merged:
+                        merged[key] = (cc, nc, tt, ct, dict(callers))
+                        continue
+                    m_cc, m_nc, m_tt, m_ct, m_callers = merged[key]
+                    for caller, stats in callers.items():
+                        old = m_callers.get(caller)
+                        m_callers[caller] = stats if old is None else tuple(a + b for a, b in zip(old, stats))
+                    merged[key] = (m_cc + cc, m_nc + nc, m_tt + tt, m_ct + ct, m_callers)
+            return merged
+
+        with self._lock:
+            stacks = dict(self._stacks)
+        interval, stats = self.sample_interval, {}
+        for stack, count in stacks.items():
+            elapsed = count * interval
+            for depth, key in enumerate(stack):
+                cc, nc, tt, ct, callers = stats.get(key, (0, 0, 0.0, 0.0, {}))
+                if key not in stack[:depth]:
+                    # recursive frames only count once towards the cumulative time
+                    cc, nc, ct = cc + count, nc + count, ct + elapsed
+                if depth == len(stack) - 1:
+                    tt += elapsed
+                if depth:
+                    c_cc, c_nc, c_tt, c_ct = callers.get(stack[depth - 1], (0, 0, 0.0, 0.0))
+                    callers[stack[depth - 1]] = (
+                        c_cc + count, c_nc + count, c_tt + (elapsed if depth == len(stack) - 1 else 0.0), c_ct + elapsed
+                    )
+                stats[key] = (cc, nc, tt, ct, callers)
+        return stats
+
+    def stats(self):
+        """
+        Returns the aggregated profile as a ``pstats.Stats`` instance which can be sorted and printed.
+        """
+        import pstats
+
+        class _Snapshot:
+            def __init__(self, stats):
+                self.stats = stats
+
+            def create_stats(self):
+                pass
+
+        return pstats.Stats(_Snapshot(self._raw_stats()))
+
+    def collapsed_stacks(self) -> str:
+        """
+        Returns the sampled stacks in the collapsed (folded) format used by flamegraph tools, one stack per line.
+        """
+        if self.mode != 'sampling':
+            raise ValueError('Collapsed stacks are only available in the "sampling" mode')
+        with self._lock:
+            stacks = dict(self._stacks)
+        lines = [
+            ';'.join(f'{name} ({filename}:{lineno})' for filename, lineno, name in stack) + f' {count}'
+            for stack, count in stacks.items()
+        ]
+        return '\n'.join(sorted(lines)) + '\n' if lines else ''
+
+    def dump(self, path, output_format=None):
+        """
+        Writes the aggregated profile to a file.
+
+        :param path: file the profile is written to
+        :param output_format: either "pstats" or "collapsed". If not given, it is derived from the file suffix
+            (".txt", ".folded" and ".collapsed" select the collapsed format)
+        :type output_format: str
+        :return: the path of the written file
+        """
+        from pathlib import Path
+        path = Path(path)
+        if output_format is None:
+            output_format = 'collapsed' if path.suffix in ('.txt', '.folded', '.collapsed') else 'pstats'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if output_format == 'pstats':
+            self.stats().dump_stats(str(path))
+        elif output_format == 'collapsed':
+            path.write_text(self.collapsed_stacks())
+        else:
+            raise ValueError(f'Unknown output format "{output_format}". Valid formats are: pstats, collapsed')
+        log.info(f'Wrote profile of "{self.name}" ({self.calls} calls) to {path}')
+        return path
+
+
+class CircuitBreaker:
+    """
+    This class implements a circuit breaker which lets callers fail fast while a target is down.
+     - closed: calls pass. After ``failure_threshold`` consecutive failures, the breaker opens.
+     - open: calls are rejected immediately. After ``recovery_timeout`` seconds, the breaker becomes half-open.
+     - half-open: up to ``half_open_max_calls`` trial calls pass. A success closes the breaker, a failure opens it again.
+       A trial call which ends without a result (e.g. it is cancelled) frees its slot via ``release``. If the trial
+       calls do not report back within ``recovery_timeout`` seconds, the breaker opens again.
+
+    Breakers are shared per target: ``CircuitBreaker.get(name)`` returns the same instance for the same name, such that
+    all functions calling the same downstream service trip together.
+
+    Example::
+
+    > 1 CircuitBreaker.get('billing-api', failure_threshold=3, recovery_timeout=10)
+    > 2 @Decorators.retry(5, 1, circuit_breaker='billing-api')
+    > 3 def charge(x):
+    >    ...
+    > # after 3 consecutive failures, calls raise CircuitOpenError for 10 seconds without calling "charge"
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+    _breakers = {}
+    _breakers_lock = Lock()
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._half_opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = Lock()
+
+    @classmethod
+    def get(cls, name, **kwargs):
+        """
+        Returns the breaker shared by all callers of the target ``name``. It is created with ``kwargs`` if it does not
+        exist yet.
+        """
+        breaker = cls._breakers.get(name)
+        if breaker is None:
+            with cls._breakers_lock:
+                breaker = cls._breakers.get(name)
+                if breaker is None:
+                    breaker = cls._breakers[name] = cls(name, **kwargs)
+        return breaker
+
+    def allow(self) -> bool:
+        """
+        Indicates if a call may pass. In the half-open state, every passing call counts as a trial call.
+        """
+        if self.state == self.CLOSED:
+            return True
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    return False
+                log.info(f'Circuit breaker "{self.name}" is half-open')
+                self.state, self._half_open_calls, self._half_opened_at = self.HALF_OPEN, 0, time.monotonic()
+            if self.state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    if time.monotonic() - self._half_opened_at >= self.recovery_timeout:
+                        log.warning(f'Circuit breaker "{self.name}" is open as its trial calls did not finish within '
+                                    f'{self.recovery_timeout} secs')
+                        self.state, self._opened_at = self.OPEN, time.monotonic()
+                    return False
+                self._half_open_calls += 1
+            return True
+
+    def release(self):
+        """
+        Frees the slot of a trial call which ended without a result, such that another call can try in its place.
+        """
+        if self.state != self.HALF_OPEN:
+            return
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._half_open_calls:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        if self.state == self.CLOSED and not self.failures:
+            return
+        with self._lock:
+            if self.state != self.CLOSED:
+                log.info(f'Circuit breaker "{self.name}" is closed')
+            self.state, self.failures = self.CLOSED, 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    log.warning(f'Circuit breaker "{self.name}" is open after {self.failures} failures')
+                self.state, self._opened_at = self.OPEN, time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self.state, self.failures, self._half_open_calls = self.CLOSED, 0, 0
+
+
+class RetryPolicy:
+    """
+    This class implements the retry loop shared by ``Decorators.retry`` and ``Decorators.retry_with_exponential_stalling``.
+    Calling an instance with a function returns the decorated function. Coroutine functions are wrapped by a coroutine
+    function which stalls via ``asyncio.sleep`` such that a failing call does not block the event loop.
+
+    Besides the number of tries and the stalling periods, a policy can
+     - randomize the stalling periods ("full" jitter: uniform between 0 and the period, "decorrelated" jitter: uniform
+       between the first period and three times the previous stalling period), capped by ``max_delay``
+     - limit the total time a call may take including all tries and stalling periods (``deadline``). A call gives up as
+       soon as the next stalling period would exceed the budget and raises a ``DeadlineExceededError``, regardless of
+       ``raise_on_failure``. Coroutines are additionally cancelled when the budget runs out during a try.
+     - consult a ``CircuitBreaker`` before every try and report the outcome to it
+    """
+
+    JITTERS = (None, 'full', 'decorrelated')
+
+    def __init__(self, times, delays, raise_on_failure=True, jitter=None, max_delay=None, deadline=None,
+                 circuit_breaker=None):
+        """
+        :param times: how many tries to execute the function
+        :type times: int
+        :param delays: callable returning an iterator over the stalling periods (in seconds) of a single call
+        :param raise_on_failure: if set to True, a FunctionNotExecutedError is raised after the last failed try.
+            Otherwise, the decorated function returns None.
+        :type raise_on_failure: bool
+        :param jitter: either None, "full" or "decorrelated"
+        :type jitter: str
+        :param max_delay: optional upper bound of a single stalling period in seconds
+        :type max_delay: float
+        :param deadline: optional total time budget of a call in seconds
+        :type deadline: float
+        :param circuit_breaker: a CircuitBreaker or the name of a shared one
+        """
+        if jitter not in self.JITTERS:
+            raise ValueError(f'Unknown jitter "{jitter}". Valid jitters are: {self.JITTERS}')
+        self.times = times
+        self.delays = delays
+        self.raise_on_failure = raise_on_failure
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.circuit_breaker = (
+            CircuitBreaker.get(circuit_breaker) if isinstance(circuit_breaker, str) else circuit_breaker
+        )
+
+    def _schedule(self):
+        """
+        Returns an iterator over the stalling periods of a single call with jitter and cap applied.
+        """
+        delays, cap = self.delays(), self.max_delay if self.max_delay is not None else float('inf')
+        if self.jitter is None:
+            return (min(delay, cap) for delay in delays)
+        if self.jitter == 'full':
+            return (uniform(0, min(delay, cap)) for delay in delays)
+
+        def decorrelated():
+            base = sleep = next(delays)
+            while True:
+                sleep = min(cap, uniform(base, sleep * 3))
+                yield sleep
+        return decorrelated()
+
+    def _start(self):
+        """
+        Returns the stalling periods and the deadline (in ``time.monotonic`` time) of a single call.
+        """
+        return self._schedule(), time.monotonic() + self.deadline if self.deadline is not None else None
+
+    def _log_try(self, func, attempt):
+        if log.isEnabledFor(logging.INFO):
+            log.info(f'Trying to execute "{func.__name__}" ({attempt}/{self.times})',
+                     extra={'function': func.__name__, 'attempt': attempt})
+
+    def _before_try(self, func):
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            log.error(f'Circuit breaker "{self.circuit_breaker.name}" is open. Not executing "{func.__name__}".',
+                      extra={'function': func.__name__})
+            raise CircuitOpenError(
+                f'Function "{func.__name__}" was not executed as circuit breaker "{self.circuit_breaker.name}" is open'
+            )
+
+    def _succeeded(self, func, attempt):
+        if log.isEnabledFor(logging.INFO):
+            log.info(f'Successfully executed "{func.__name__}".', extra={'function': func.__name__, 'attempt': attempt})
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def _aborted(self):
+        """
+        Handles a try which was interrupted by a BaseException such as ``asyncio.CancelledError`` or
+        ``KeyboardInterrupt``. It is not counted as a failure of the target but must not keep a trial slot.
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release()
+
+    def _give_up(self, error_class, message, error, func, attempt, always_raise=False):
+        log.error(message, extra={'function': func.__name__, 'attempt': attempt})
+        if self.raise_on_failure or always_raise:
+            raise error_class(f'{message} for the following reason: {error}') from error
+        return None
+
+    def _failed(self, func, attempt, error, delays, deadline_at):
+        """
+        Handles a failed try. Returns the stalling period before the next try or None if the call gives up.
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+        log.warning(f'Execution failed for the following reason: {error}',
+                    extra={'function': func.__name__, 'attempt': attempt})
+        if attempt >= self.times:
+            return self._give_up(
+                FunctionNotExecutedError, f'Function "{func.__name__}" could not be executed after {self.times} tries',
+                error, func, attempt
+            )
+        delay = next(delays)
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            return self._give_up(
+                DeadlineExceededError,
+                f'Function "{func.__name__}" could not be executed within the deadline of {self.deadline} secs',
+                error, func, attempt, always_raise=True
+            )
+        log.info(f"Stalling {round(delay, 3)} secs before next execution try.",
+                 extra={'function': func.__name__, 'attempt': attempt, 'delay_s': delay})
+        return delay
+
+    def __call__(self, func):
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                """
+                Wraps the original coroutine function and adds the retry functionality
+                """
+                from asyncio import sleep, wait_for
+                delays, deadline_at = self._start()
+                for attempt in range(1, self.times + 1):
+                    self._before_try(func)
+                    try:
+                        self._log_try(func, attempt)
+                        if deadline_at is None:
+                            res = await func(*args, **kwargs)
+                        else:
+                            res = await wait_for(func(*args, **kwargs), max(deadline_at - time.monotonic(), 0))
+                    except Exception as e:
+                        delay = self._failed(func, attempt, e, delays, deadline_at)
+                        if delay is None:
+                            return None
+                        await sleep(delay)
+                    except BaseException:
+                        self._aborted()
+                        raise
+                    else:
+                        self._succeeded(func, attempt)
+                        return res
+            return wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Wraps the original function and adds the retry functionality
+            """
+            delays, deadline_at = self._start()
+            for attempt in range(1, self.times + 1):
+                self._before_try(func)
+                try:
+                    self._log_try(func, attempt)
+                    res = func(*args, **kwargs)
+                except Exception as e:
+                    delay = self._failed(func, attempt, e, delays, deadline_at)
+                    if delay is None:
+                        return None
+                    time.sleep(delay)
+                except BaseException:
+                    self._aborted()
+                    raise
+                else:
+                    self._succeeded(func, attempt)
+                    return res
+        return wrapper
+
+
+class LogSampler:
+    """
+    This class is the sampling policy of the logging decorators ``run_time``, ``show_args`` and ``counter``. It keeps
+    the logs of hot functions readable and prevents the logging from costing more than the functions themselves:
+     - every: only every ``every``-th call is logged
+     - rate: a call is logged with the probability ``rate``
+     - limit: at most ``limit`` calls are logged per ``window`` seconds. The first call after a window in which calls
+       were suppressed logs how many.
+
+    A policy can be passed to several decorators. Each decorated function samples its calls on its own.
+
+    Example::
+
+    > @Decorators.show_args(sampling=LogSampler(limit=10, window=60))
+    > 1 def foo(x):
+    >    ...
+    > # console prints the arguments of at most 10 calls per minute
+    > # console prints: Suppressed 120345 log records of "foo" (show_args) within 60s
+    """
+
+    def __init__(self, every=None, rate=None, limit=None, window=1.0):
+        if sum(option is not None for option in (every, rate, limit)) != 1:
+            raise ValueError('Exactly one of every, rate and limit has to be given')
+        if every is not None and every < 1:
+            raise ValueError(f'every has to be a positive number of calls, not {every}')
+        if rate is not None and not 0 <= rate <= 1:
+            raise ValueError(f'rate has to be a probability, not {rate}')
+        if limit is not None and (limit < 0 or window <= 0):
+            raise ValueError(f'limit has to be non-negative and window positive, not {limit} and {window}')
+        self.every = every
+        self.rate = rate
+        self.limit = limit
+        self.window = window
+
+    def gate(self, func, decorator):
+        """
+        Returns a function which indicates if the current call of ``func`` is logged by ``decorator``.
+        """
+        if self.every is not None:
+            from itertools import count
+            calls, every = count(1), self.every
+            return lambda: not next(calls) % every
+        if self.rate is not None:
+            rate = self.rate
+            return lambda: random() < rate
+        limit, window = self.limit, int(self.window * 1e9)
+        perf_counter_ns = time.perf_counter_ns
+        lock = Lock()
+        # end of the current window, calls and suppressed calls within it
+        state = [0, 0, 0]
+
+        def sampled():
+            now = perf_counter_ns()
+            suppressed = 0
+            with lock:
+                if now >= state[0]:
+                    suppressed, state[:] = state[2], [now + window, 0, 0]
+                state[1] += 1
+                passed = state[1] <= limit
+                if not passed:
+                    state[2] += 1
+            if suppressed:
+                self._log_suppressed(func, decorator, suppressed)
+            return passed
+        return sampled
+
+    def _log_suppressed(self, func, decorator, suppressed):
+        if log.isEnabledFor(logging.INFO):
+            log.info(f'Suppressed {suppressed} log records of "{func.__name__}" ({decorator}) within {self.window}s',
+                     extra={'function': func.__name__, 'suppressed': suppressed})
+
+
+class MemoizeCache:
+    """
+    This class is the bounded in-memory cache behind ``Decorators.memoize``. Entries are evicted in least recently used
+    order once ``max_entries`` or ``max_bytes`` is exceeded and expire ``ttl`` seconds after they have been stored.
+
+    Reads do not take a lock: they rely on single operations of the ``OrderedDict`` being atomic, i.e. a read is a
+    dictionary lookup followed by moving the entry to the end of the LRU order. Only storing and evicting entries is
+    serialized. Hits, misses and evictions are counted by counters of the module wide ``metrics`` registry.
+
+    Keyword arguments are part of the key in the order of their names, so the order in which they are passed does
+    not matter. Unhashable arguments are converted into a hashable key on every call. As this costs time in proportion
+    to their size, arguments with more than ``max_key_items`` items in total are not cached at all.
+    """
+
+    _KWARGS_MARK = object()
+    _MISSING = object()
+
+    def __init__(self, name, max_entries=1024, max_bytes=None, ttl=None, sizeof=getsizeof, max_key_items=64):
+        """
+        :param name: name of the cached function, used as label of the statistics
+        :param max_entries: maximum number of entries. None disables the limit.
+        :type max_entries: int
+        :param max_bytes: maximum sum of the entries' sizes as computed by ``sizeof``. None disables the limit.
+        :type max_bytes: int
+        :param ttl: seconds after which an entry expires. None disables the expiry.
+        :type ttl: float
+        :param sizeof: function returning the size of a cached value in bytes
+        :param max_key_items: maximum number of items of unhashable arguments (lists, dicts and sets, counted
+            recursively) which are converted into a key
+        :type max_key_items: int
+        """
+        self.name = name
+        self.max_key_items = max_key_items
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.current_bytes = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+        labels = {'function': name}
+        self._hits = metrics.counter('cache_hits_total', 'Hits of memoized functions', labels)
+        self._misses = metrics.counter('cache_misses_total', 'Misses of memoized functions', labels)
+        self._evictions = metrics.counter('cache_evictions_total', 'Evictions of memoized functions', labels)
+
+    def _freeze(self, obj, budget=None):
+        """
+        Returns a hashable representation of an argument. Containers are tagged with their type, such that e.g.
+        [1, 2] and (1, 2) result in different keys. Their items are only converted recursively if they are not
+        hashable as they are.
+
+        :raises TypeError if the argument contains an unhashable object which is no list, tuple, dict or set, or more
+            than ``max_key_items`` items
+        """
+        if budget is None:
+            budget = [self.max_key_items]
+        if isinstance(obj, (list, tuple, dict, set, frozenset)):
+            budget[0] -= len(obj)
+            if budget[0] < 0:
+                raise TypeError(f'Arguments with more than {self.max_key_items} items are not cached')
+        if isinstance(obj, (list, tuple)):
+            items = tuple(obj)
+            try:
+                hash(items)
+            except TypeError:
+                items = tuple(self._freeze(item, budget) for item in obj)
+            return type(obj), items
+        if isinstance(obj, dict):
+            return type(obj), frozenset((key, self._freeze(value, budget)) for key, value in obj.items())
+        if isinstance(obj, (set, frozenset)):
+            return type(obj), frozenset(self._freeze(item, budget) for item in obj)
+        hash(obj)
+        return obj
+
+    @classmethod
+    def make_key(cls, args, kwargs):
+        """
+        Builds the cache key of a call. The key is only hashable if all arguments are. Otherwise, it has to be frozen
+        via ``_freeze`` which is only done after a lookup failed to keep the common case cheap.
+        """
+        if kwargs:
+            items = tuple(kwargs.items()) if len(kwargs) == 1 else tuple(sorted(kwargs.items()))
+            return args + (cls._KWARGS_MARK,) + items
+        return args
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value of a key or ``default`` if the key is not cached or has expired.
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at, _ = entry
+            if expires_at is None or time.monotonic() < expires_at:
+                try:
+                    self._data.move_to_end(key)
+                except KeyError:
+                    # evicted by another thread in between, the value is still valid
+                    pass
+                self._hits.inc()
+                return value
+            self._remove(key, entry)
+        self._misses.inc()
+        return default
+
+    def put(self, key, value):
+        """
+        Stores a value and evicts the least recently used entries if the cache exceeds its limits.
+        """
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[2]
+            self._data[key] = (value, expires_at, size)
+            self.current_bytes += size
+            while (self.max_entries is not None and len(self._data) > self.max_entries) or \
+                    (self.max_bytes is not None and self.current_bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self._evictions.inc()
+
+    def _remove(self, key, entry):
+        with self._lock:
+            if self._data.get(key) is entry:
+                del self._data[key]
+                self.current_bytes -= entry[2]
+                self._evictions.inc()
+
+    def expire(self):
+        """
+        Removes all expired entries. Expired entries are otherwise only removed when they are read or evicted.
+        """
+        now = time.monotonic()
+        for key, entry in list(self._data.items()):
+            if entry[1] is not None and entry[1] <= now:
+                self._remove(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def info(self) -> dict:
+        """
+        Returns the statistics of the cache.
+
+        :return: a dictionary with the keys hits, misses, evictions, hit_ratio, entries and bytes
+        :rtype: dict
+        """
+        hits, misses = self._hits.value, self._misses.value
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': self._evictions.value,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': len(self._data),
+            'bytes': self.current_bytes,
+        }
+
+
+class DiskCache:
+    """
+    This class is the persistent result cache behind ``Decorators.disk_cache``. Results are pickled into a SQLite
+    database, so they survive restarts and are shared by all processes on a machine which use the same file.
+    The database runs in write-ahead-log mode: readers do not block each other or the writer, and writers of different
+    processes are serialized by SQLite's file lock. Each thread and process uses its own connection.
+
+    Once the pickled results exceed ``max_bytes``, the least recently used ones are deleted. To keep reads cheap, the
+    access time of an entry is only updated if it is older than ``touch_interval`` seconds.
+    """
+
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS results '
+        '(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)',
+        'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+        "INSERT OR IGNORE INTO meta VALUES ('total_bytes', 0)",
+    )
+
+    def __init__(self, path, max_bytes=2**30, touch_interval=60.0, timeout=30.0):
+        """
+        :param path: path of the SQLite database file. Missing directories are created.
+        :param max_bytes: maximum size of all pickled results. None disables the limit.
+        :type max_bytes: int
+        :param touch_interval: minimum seconds between two updates of an entry's access time
+        :type touch_interval: float
+        :param timeout: seconds to wait for a lock held by another process before failing
+        :type timeout: float
+        """
+        from pathlib import Path
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.timeout = timeout
+        self._local = local()
+        labels = {'cache': str(self.path)}
+        self._hits = metrics.counter('disk_cache_hits_total', 'Hits of disk cached functions', labels)
+        self._misses = metrics.counter('disk_cache_misses_total', 'Misses of disk cached functions', labels)
+        self._evictions = metrics.counter('disk_cache_evictions_total', 'Evictions of disk cached functions', labels)
+
+    def _connection(self):
+        """
+        Returns the connection of the calling thread. A forked process opens a new connection.
+        """
+        from os import getpid
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != getpid():
+            import sqlite3
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                for statement in self._SCHEMA:
+                    conn.execute(statement)
+            self._local.conn, self._local.pid = conn, getpid()
+        return conn
+
+    @classmethod
+    def _canonical(cls, obj):
+        """
+        Returns a representation of an argument whose pickle does not depend on the process, i.e. dictionaries and sets
+        are sorted as their iteration order may differ between processes.
+        """
+        if isinstance(obj, (list, tuple)):
+            return type(obj).__name__, [cls._canonical(item) for item in obj]
+        if isinstance(obj, dict):
+            items = [(cls._canonical(key), cls._canonical(value)) for key, value in obj.items()]
+            return type(obj).__name__, sorted(items, key=repr)
+        if isinstance(obj, (set, frozenset)):
+            return type(obj).__name__, sorted((cls._canonical(item) for item in obj), key=repr)
+        return obj
+
+    @staticmethod
+    def function_version(func) -> str:
+        """
+        Returns a hash of the function's source code or of its bytecode if the source is not available. Changing the
+        function therefore invalidates its cached results.
+        """
+        from hashlib import sha256
+        try:
+            from inspect import getsource
+            return sha256(getsource(func).encode()).hexdigest()
+        except (OSError, TypeError):
+            import marshal
+            return sha256(marshal.dumps(func.__code__)).hexdigest()
+
+    @classmethod
+    def make_key(cls, func_name, version, args, kwargs) -> str:
+        """
+        Builds the key of a call as hash of the function's qualified name, its version and its arguments. The arguments
+        are pickled without memo ("fast" mode), as the memo makes the pickle depend on the identity of objects: equal
+        arguments such as ``(s1, s1)`` and ``(s1, s2)`` with ``s1 == s2`` have to result in the same key.
+
+        :raises TypeError or pickle.PicklingError if an argument can not be pickled, ValueError or RecursionError if it
+            is cyclic
+        """
+        import pickle
+        from hashlib import sha256
+        payload = (func_name, version, cls._canonical(args), sorted((k, cls._canonical(v)) for k, v in kwargs.items()))
+        buffer = BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=4)
+        pickler.fast = True
+        pickler.dump(payload)
+        return sha256(buffer.getvalue()).hexdigest()
+
+    def get(self, key, default=None):
+        """
+        Returns the unpickled result stored for a key or ``default`` if there is none.
+        """
+        import pickle
+        conn = self._connection()
+        row = conn.execute('SELECT value, accessed FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self._misses.inc()
+            return default
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+        self._hits.inc()
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        """
+        Pickles and stores a result. Afterwards, the least recently used results are deleted while the cache exceeds
+        ``max_bytes``.
+
+        :raises TypeError or pickle.PicklingError if the value can not be pickled
+        """
+        import pickle
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            return
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            old = conn.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+            conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', (key, blob, len(blob), time.time()))
+            conn.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'total_bytes'", (len(blob) - (old[0] if old else 0),)
+            )
+            total = conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0]
+            while self.max_bytes is not None and total > self.max_bytes:
+                rows = conn.execute('SELECT key, size FROM results ORDER BY accessed LIMIT 64').fetchall()
+                for evicted_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute('DELETE FROM results WHERE key = ?', (evicted_key,))
+                    total -= size
+                    self._evictions.inc()
+                conn.execute("UPDATE meta SET value = ? WHERE name = 'total_bytes'", (total,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM results')
+            conn.execute("UPDATE meta SET value = 0 WHERE name = 'total_bytes'")
+
+    def info(self) -> dict:
+        """
+        Returns the statistics of the cache as seen by this process.
+
+        :return: a dictionary with the keys hits, misses, evictions, entries and bytes
+        :rtype: dict
+        """
+        conn = self._connection()
+        entries = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        total = conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0]
+        return {
+            'hits': self._hits.value,
+            'misses': self._misses.value,
+            'evictions': self._evictions.value,
+            'entries': entries,
+            'bytes': total,
+        }
+
+
+class ArgumentRepr(Repr):
+    """
+    This class renders function arguments for ``Decorators.show_args`` with bounded cost and length. It is based on
+    ``reprlib.Repr``, so containers are truncated after ``max_items`` items and nesting below ``max_depth`` levels
+    is elided. In addition,
+     - truncated containers are annotated with their length
+     - array-like objects (NumPy arrays, pandas objects, ...) are summarized by their type, shape and dtype instead of
+       rendering their values
+     - the whole rendering is cut at ``max_length`` characters
+    """
+
+    def __init__(self, max_length=200, max_depth=3, max_items=10):
+        super().__init__()
+        self.max_length = max_length
+        self.maxlevel = max_depth
+        self.maxlist = self.maxtuple = self.maxdict = self.maxset = self.maxfrozenset = self.maxdeque = max_items
+        self.maxarray = max_items
+        self.maxstring = self.maxother = max(max_length // 2, 20)
+        self.max_items = max_items
+
+    def repr1(self, x, level):
+        shape = getattr(x, 'shape', None)
+        if shape is not None and not isinstance(x, type):
+            dtype = getattr(x, 'dtype', None)
+            if dtype is None and hasattr(x, 'dtypes'):
+                dtype = 'mixed'
+            return f'{type(x).__name__}(shape={shape}, dtype={dtype})'
+        rendered = super().repr1(x, level)
+        if isinstance(x, (list, tuple, dict, set, frozenset)) and len(x) > self.max_items:
+            rendered += f' (len={len(x)})'
+        return rendered
+
+    def repr(self, x):
+        rendered = super().repr(x)
+        if len(rendered) > self.max_length:
+            rendered = rendered[:self.max_length - 3] + '...'
+        return rendered
+
+
+class ArgumentValidator:
+    """
+    This class compiles the argument checks of ``Decorators.accepted_argument_types``, ``Decorators.validate`` and
+    ``Decorators.accepted_arguments``. All the work which does not depend on the actual arguments is done once when a
+    function is decorated:
+     - the expected types and valid values are bound to the parameters of the function's signature
+     - valid values are stored in a frozenset, so a membership test is a hash lookup instead of a linear scan
+     - the check is generated as a function whose parameters mirror the decorated function's signature. Hence, the
+       interpreter binds positional and keyword arguments to parameter names, and the body consists of one
+       ``isinstance`` or membership test per checked parameter.
+
+    The names the generated check uses besides the parameters start with ``__uv_``, so they can not be shadowed by a
+    parameter of the decorated function.
+    """
+
+    _MISSING = object()
+    _PREFIX = '__uv_'
+
+    @staticmethod
+    def _membership(values):
+        """
+        Returns a frozenset of the valid values, or a tuple if some of them are unhashable.
+        """
+        values = tuple(values)
+        try:
+            return frozenset(values)
+        except TypeError:
+            return values
+
+    @staticmethod
+    def runtime_type(annotation):
+        """
+        Converts a type annotation into something ``isinstance`` accepts or None if it can not be checked at runtime.
+        Unions (including Optional) become tuples and parametrized generics such as ``list[int]`` their origin. Like
+        type checkers, ``float`` also accepts ints and ``complex`` ints and floats (the numeric tower).
+        """
+        from inspect import Parameter
+        from typing import Any, Union, get_args, get_origin
+        if annotation is Any or annotation is Parameter.empty:
+            return None
+        if annotation is None:
+            return type(None)
+        if annotation is float:
+            return int, float
+        if annotation is complex:
+            return int, float, complex
+        if isinstance(annotation, type):
+            return annotation
+        origin = get_origin(annotation)
+        import types
+        if origin is Union or (origin is not None and origin is getattr(types, 'UnionType', None)):
+            members = tuple(ArgumentValidator.runtime_type(arg) for arg in get_args(annotation))
+            return None if None in members else members
+        return origin if isinstance(origin, type) else None
+
+    @classmethod
+    def compile(cls, func, types=None, values=None, positional_types=None):
+        """
+        Generates the check of a function's arguments. The returned function takes the same arguments as ``func`` and
+        raises a TypeError if an argument does not have its expected type or a SyntaxError if it is no valid value.
+        Arguments which are not passed (i.e. use their default value) are not checked. The types and valid values of
+        ``*args`` and ``**kwargs`` apply to each of their items, as their annotations do.
+
+        :param func: function whose arguments are checked
+        :param types: mapping of parameter names to the expected types. If neither ``types`` nor ``positional_types``
+            are given, the function's type annotations are used.
+        :type types: dict
+        :param values: mapping of parameter names to the collection of their valid values
+        :type values: dict
+        :param positional_types: expected types of the positional parameters in the order of the signature. Types
+            beyond the named positional parameters apply to the items of ``*args``.
+        :type positional_types: tuple
+        :return: the check function or None if nothing has to be checked
+        """
+        from inspect import Parameter, signature
+        parameters = list(signature(func).parameters.values())
+        prefix = cls._PREFIX
+        colliding = [p.name for p in parameters if p.name.startswith(prefix)]
+        if colliding:
+            raise ValueError(f'Arguments of "{func.__qualname__}" can not be checked as parameter names starting with '
+                             f'"{prefix}" are reserved: {colliding}')
+        var_positional = next((p.name for p in parameters if p.kind == Parameter.VAR_POSITIONAL), None)
+        var_types = ()
+        if positional_types is not None:
+            positional = [p for p in parameters if p.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)]
+            types = {p.name: t for p, t in zip(positional, positional_types)}
+            var_types = tuple(positional_types[len(positional):])
+            if var_types and var_positional is None:
+                raise TypeError(
+                    f'{len(positional_types)} argument types were given but "{func.__qualname__}" only takes '
+                    f'{len(positional)} positional arguments'
+                )
+        elif types is None:
+            from typing import get_type_hints
+            try:
+                hints = get_type_hints(func)
+            except Exception:
+                hints = getattr(func, '__annotations__', {})
+            types = {name: cls.runtime_type(hint) for name, hint in hints.items() if name != 'return'}
+        types = {name: expected for name, expected in types.items() if expected is not None}
+        values = {name: cls._membership(valid) for name, valid in (values or {}).items()}
+        if not types and not values and not var_types:
+            return None
+
+        namespace = {f'{prefix}missing': cls._MISSING, f'{prefix}type_error': cls._type_error,
+                     f'{prefix}value_error': cls._value_error}
+        signature_parts, body, kinds = [], [], [p.kind for p in parameters]
+        for index, parameter in enumerate(parameters):
+            name = parameter.name
+            if parameter.kind == Parameter.VAR_POSITIONAL:
+                signature_parts.append(f'*{name}')
+                for position, expected in enumerate(var_types):
+                    namespace[f'{prefix}type_{name}_{position}'] = expected
+                    body.append(
+                        f'    if len({name}) > {position} and not isinstance({name}[{position}], '
+                        f'{prefix}type_{name}_{position}): '
+                        f'{prefix}type_error({f"{name}[{position}]"!r}, {name}[{position}], {prefix}type_{name}_{position})'
+                    )
+            elif parameter.kind == Parameter.VAR_KEYWORD:
+                signature_parts.append(f'**{name}')
+            else:
+                if parameter.kind == Parameter.KEYWORD_ONLY and Parameter.VAR_POSITIONAL not in kinds[:index] and \
+                        '*' not in signature_parts:
+                    signature_parts.append('*')
+                signature_parts.append(f'{name}={prefix}missing')
+                if parameter.kind == Parameter.POSITIONAL_ONLY and \
+                        (index + 1 == len(parameters) or parameters[index + 1].kind != Parameter.POSITIONAL_ONLY):
+                    signature_parts.append('/')
+            if name not in types and name not in values:
+                continue
+            if name in types:
+                namespace[f'{prefix}type_{name}'] = types[name]
+            if name in values:
+                namespace[f'{prefix}values_{name}'] = values[name]
+            if parameter.kind == Parameter.VAR_POSITIONAL:
+                body.append(f'    for {prefix}index, {prefix}item in enumerate({name}):')
+                body.extend(cls._item_checks(name, f'{prefix}item', f'f"{name}[{{{prefix}index}}]"', types, values))
+            elif parameter.kind == Parameter.VAR_KEYWORD:
+                body.append(f'    for {prefix}index, {prefix}item in {name}.items():')
+                body.extend(cls._item_checks(name, f'{prefix}item', f'{prefix}index', types, values))
+            else:
+                body.append(f'    if {name} is not {prefix}missing:')
+                body.extend(cls._item_checks(name, name, repr(name), types, values))
+        source = f'def check({", ".join(signature_parts)}):\n' + ('\n'.join(body) or '    pass')
+        exec(compile(source, f'<argument check of {func.__qualname__}>', 'exec'), namespace)
+        return namespace['check']
+
+    @classmethod
+    def _item_checks(cls, name, value, label, types, values):
+        """
+        Returns the lines of the generated check which test the expression ``value`` against the expected type and the
+        valid values of the parameter ``name``. ``label`` is the expression of the name the errors report.
+        """
+        prefix, lines = cls._PREFIX, []
+        if name in types:
+            lines.append(f'        if not isinstance({value}, {prefix}type_{name}): '
+                         f'{prefix}type_error({label}, {value}, {prefix}type_{name})')
+        if name in values:
+            lines.extend((
+                f'        try:',
+                f'            {prefix}valid = {value} in {prefix}values_{name}',
+                f'        except TypeError:',
+                f'            {prefix}valid = False',
+                f'        if not {prefix}valid: {prefix}value_error({label}, {value}, {prefix}values_{name})',
+            ))
+        return lines
+
+    @classmethod
+    def compile_membership(cls, accepted_args, skip=0):
+        """
+        Generates the check of ``Decorators.accepted_arguments``: every argument (except the first ``skip`` positional
+        ones) has to be one of ``accepted_args``.
+        """
+        accepted = cls._membership(accepted_args)
+
+        def check(*args, **kwargs):
+            try:
+                if accepted.issuperset(args[skip:] if skip else args) and \
+                        (not kwargs or accepted.issuperset(kwargs.values())):
+                    return
+            except (AttributeError, TypeError):
+                # unhashable arguments or unhashable accepted values
+                if all(cls._contains(accepted, a) for a in args[skip:]) and \
+                        all(cls._contains(accepted, a) for a in kwargs.values()):
+                    return
+            raise SyntaxError(f'Encountered a non-valid argument.\nValid arguments are: {accepted_args}')
+
+        return check
+
+    @staticmethod
+    def _contains(accepted, value):
+        try:
+            return value in accepted
+        except TypeError:
+            return False
+
+    @staticmethod
+    def _type_error(name, value, expected):
+        raise TypeError(
+            f'Argument Types do not match expected types.\nExpected {expected} for "{name}" but got {type(value)}'
+        )
+
+    @staticmethod
+    def _value_error(name, value, valid):
+        raise SyntaxError(f'Encountered a non-valid argument for "{name}": {value!r}.\nValid arguments are: {valid}')
+
+
+class WrapperFusion:
+    """
+    This class generates the single wrapper of ``Decorators.compose``. Every fused decorator adds a stage: a code
+    template in which the line ``{body}`` is replaced by the stages further inside and finally by the call of the
+    decorated function, the objects the template refers to and the attributes it sets on the wrapper (e.g.
+    ``histogram`` or ``cache``). The stages communicate via the arguments ``args`` and ``kwargs`` and the result ``_res``.
+    In the templates, ``{i}`` is replaced by the stage's index to keep the names of different stages apart and ``{await}``
+    by "await " if the decorated function is a coroutine function.
+
+    Hence, a fused call executes one frame, packs the arguments once and the behaviours run in the same order as if
+    the decorators were stacked.
+    """
+
+    BODY = '{body}'
+
+    def __init__(self, func):
+        self.func = func
+        self.is_async = iscoroutinefunction(func)
+        self.stages = []
+
+    def add(self, code, namespace=None, attributes=None):
+        """
+        Adds a stage inside the stages which have been added before.
+
+        :param code: lines of the stage's code template
+        :type code: tuple
+        :param namespace: objects referred to by the template
+        :type namespace: dict
+        :param attributes: attributes which are set on the generated wrapper
+        :type attributes: dict
+        """
+        self.stages.append((code, namespace or {}, attributes or {}))
+
+    def build(self):
+        """
+        Generates the wrapper function.
+        """
+        if self.is_async:
+            from asyncio import sleep
+        else:
+            sleep = time.sleep
+        namespace = {'_func': self.func, '_perf_ns': time.perf_counter_ns, '_sleep': sleep}
+        body = ['_res = {await}_func(*args, **kwargs)']
+        for index in range(len(self.stages) - 1, -1, -1):
+            code, stage_namespace, _ = self.stages[index]
+            lines = []
+            for line in code:
+                if line.strip() == self.BODY:
+                    indent = line[:len(line) - len(line.lstrip())]
+                    lines.extend(indent + inner for inner in body)
+                else:
+                    lines.append(line.replace('{i}', str(index)))
+            body = lines
+            namespace.update({name.replace('{i}', str(index)): value for name, value in stage_namespace.items()})
+        source = '\n'.join(
+            [f'{"async " if self.is_async else ""}def wrapper(*args, **kwargs):', '    _res = None']
+            + ['    ' + line for line in body] + ['    return _res']
+        ).replace('{await}', 'await ' if self.is_async else '')
+        exec(compile(source, f'<fused wrapper of {self.func.__qualname__}>', 'exec'), namespace)
+        wrapper = wraps(self.func)(namespace['wrapper'])
+        for _, _, attributes in reversed(self.stages):
+            wrapper.__dict__.update(attributes)
+        return wrapper
+
+
+class Decorators:
+    """
+    This class provides a set of functionality with respect to decorate functions. These decorators are considered
+    util as they prevent to repeat the same code, add functionality to a function on the fly, allows a lot of type
+    and input checking and so on.
+
+    All the functions defined inside this class take a function as an input and return a decorated function.
+    Coroutine functions (``async def``) are supported as well: they are decorated by coroutine functions which await
+    the original one, i.e. run times cover the awaited execution and retries stall via ``asyncio.sleep``.
+
+    In production mode (see ``set_production_mode``), the diagnostic decorators return the original function
+    unchanged, so instrumentation can stay in the code without any overhead per call.
+    """
+
+    DIAGNOSTIC = frozenset((
+        'run_time', 'profile', 'show_args', 'counter', 'class_object_has_attr', 'accepted_arguments',
+        'accepted_arguments_within_class_methods', 'accepted_argument_types', 'validate', 'container_non_empty',
+    ))
+    STRIPPABLE = DIAGNOSTIC | {'memoize', 'disk_cache', 'retry', 'retry_with_exponential_stalling'}
+    _stripped_names = frozenset()
+
+    # emptiness checks of container_non_empty by type, see _emptiness_check
+    _PEEK = object()
+    _EMPTINESS_CHECKS = {
+        **dict.fromkeys((str, bytes, bytearray, list, tuple, dict, set, frozenset, range), not_),
+        IOBase: None,
+    }
+    _emptiness_check_cache = {}
+
+    @classmethod
+    def set_production_mode(cls, enabled=True, allow=(), deny=()):
+        """
+        Switches the production mode on or off. In production mode, the decorators in ``DIAGNOSTIC`` except the ones in
+        ``allow`` and the ones in ``deny`` return the decorated function unchanged. As this is decided when a function
+        is decorated, the mode has to be set before the modules using the decorators are imported.
+
+        The mode can also be set by the environment variables ``UTILITIES_PRODUCTION`` (1, true, yes or on) and
+        ``UTILITIES_PRODUCTION_ALLOW`` and ``UTILITIES_PRODUCTION_DENY`` (comma separated decorator names) which are
+        read when this module is imported.
+
+        Example::
+
+        > Decorators.set_production_mode(allow=['accepted_argument_types'], deny=['memoize'])
+        > import my_module
+        > # run_time, counter, ... of my_module are stripped while argument types are still checked and
+        > # memoize is stripped in addition
+
+        :param enabled: if set to True, the production mode is switched on
+        :type enabled: bool
+        :param allow: names of diagnostic decorators which stay active
+        :param deny: names of further decorators which are stripped (e.g. "retry")
+        """
+        allow, deny = frozenset(allow), frozenset(deny)
+        unknown = (allow | deny) - cls.STRIPPABLE
+        if unknown:
+            raise ValueError(f'Unknown decorators {sorted(unknown)}. Valid decorators are: {sorted(cls.STRIPPABLE)}')
+        cls._stripped_names = (cls.DIAGNOSTIC - allow) | deny if enabled else frozenset()
+
+    @classmethod
+    def _set_production_mode_from_environment(cls):
+        """
+        Sets the production mode from the environment variables. Contrary to ``set_production_mode``, unknown decorator
+        names are ignored with a warning, as a typo in a variable must not break every program importing this module.
+        The warning goes to the module's logger directly since the module logger is not set up at import.
+        """
+        from os import environ
+
+        def names(variable):
+            given = [name.strip() for name in environ.get(variable, '').split(',') if name.strip()]
+            unknown = [name for name in given if name not in cls.STRIPPABLE]
+            if unknown:
+                logging.getLogger(__name__).warning(
+                    f'Ignoring unknown decorators {unknown} in {variable}. Valid decorators are: '
+                    f'{sorted(cls.STRIPPABLE)}'
+                )
+            return [name for name in given if name in cls.STRIPPABLE]
+
+        cls.set_production_mode(
+            environ.get('UTILITIES_PRODUCTION', '').strip().lower() in ('1', 'true', 'yes', 'on'),
+            allow=names('UTILITIES_PRODUCTION_ALLOW'), deny=names('UTILITIES_PRODUCTION_DENY')
+        )
+
+    @staticmethod
+    def _unchanged(func):
+        """
+        Decorator which returns the function unchanged. Stripped decorators with parameters return it.
+        """
+        return func
+
+    @staticmethod
+    def run_time(func=None, *, histogram=False, report_interval=None, sampling=None):
+        """
+        When decorating a function with this decorator, it indicates the function's run time in a hh:mm:ss after
+        the function returns.
+
+        For functions which are called very often, logging every call costs more than the function itself. Passing
+        ``histogram=True`` records the durations into a ``LatencyHistogram`` instead, which is attached to the decorated
+        function as ``histogram``. Its summary (count, mean, p50, p95, p99 and max) can be logged on demand via
+        ``foo.histogram.report()`` or every ``report_interval`` seconds. Alternatively, a ``LogSampler`` passed as
+        ``sampling`` logs the run time of a sample of the calls only.
+
+        Example::
+
+        > # Assume the function needs exactly 1 minute, 13.534 seconds to execute
+        > @Decorators.run_time
+        > 1 def foo(x):
+        > 2   ...
+        > ...
+        > 7 foo(10)
+        > #console prints "00:01:13,534"
+
+        > @Decorators.run_time(histogram=True, report_interval=60)
+        > 1 def bar(x):
+        > 2   ...
+        > # console prints every minute: Latency of "bar" over 120345 calls: mean=12.345µs, p50=11.904µs, ...
+
+        :param func: function to decorate
+        :param histogram: if set to True, durations are aggregated into a histogram instead of logged per call
+        :type histogram: bool
+        :param report_interval: optional interval in seconds in which the histogram summary is logged
+        :type report_interval: float
+        :param sampling: optional policy which selects the calls whose run time is logged. Not used by the histogram.
+        :type sampling: LogSampler
+        :return: decorated function which indicates function run time
+        """
+        if func is None:
+            return partial(Decorators.run_time, histogram=histogram, report_interval=report_interval, sampling=sampling)
+        assert callable(func)
+        if 'run_time' in Decorators._stripped_names:
+            return func
+
+        if histogram:
+            return Decorators._run_time_histogram(func, report_interval)
+        log_run_time = Decorators._sampled(partial(Decorators._log_run_time, func), func, sampling, 'run_time')
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                """
+                Wraps the original coroutine function and displays the run time of its awaited execution
+                """
+                start = time.perf_counter_ns()
+                ret = await func(*args, **kwargs)
+                log_run_time(time.perf_counter_ns() - start)
+                return ret
+            return wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Wraps the original function and adds the decorator's run time display functionality
+            """
+            start = time.perf_counter_ns()
+            ret = func(*args, **kwargs)
+            log_run_time(time.perf_counter_ns() - start)
+            return ret
+
+        return wrapper
+
+    @staticmethod
+    def _log_run_time(func, duration_ns):
+        if not log.isEnabledFor(logging.INFO):
+            return
+        m, s = divmod(duration_ns / 1e9, 60)
+        h, m = divmod(m, 60)
+        ms = int(s % 1 * 1000)
+        s, m, h = int(round(s, 0)), int(round(m, 0)), int(round(h, 0))
+        log.info(
+            f'Execution Time (hh:mm:sec) for function "{func.__name__}": {h:02d}:{m:02d}:{s:02d},{ms:03d}',
+            extra={'function': func.__name__, 'duration_ns': duration_ns}
+        )
+
+    @staticmethod
+    def _sampled(log_func, func, sampling, decorator):
+        """
+        Returns ``log_func`` or, given a ``LogSampler``, a function which only calls it for the sampled calls. Calls
+        are only sampled while their records would be written at all.
+        """
+        if sampling is None:
+            return log_func
+        sampled = sampling.gate(func, decorator)
+
+        def sampled_log(*args):
+            if log.isEnabledFor(logging.INFO) and sampled():
+                log_func(*args)
+        return sampled_log
+
+    @staticmethod
+    def _duration_histogram(func):
+        return metrics.histogram(
+            'function_duration_seconds', 'Run time of functions decorated by Decorators.run_time',
+            labels={'function': f'{func.__module__}.{func.__qualname__}'}
+        )
+
+    @staticmethod
+    def _run_time_histogram(func, report_interval=None):
+        """
+        Returns the histogram variant of the run_time decorator. Durations are measured with ``time.perf_counter_ns``.
+        """
+        hist = Decorators._duration_histogram(func)
+        perf_counter_ns = time.perf_counter_ns
+        interval = int(report_interval * 1e9) if report_interval else None
+        next_report = [perf_counter_ns() + interval] if interval else None
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                """
+                Wraps the original coroutine function and records the run time of its awaited execution
+                """
+                start = perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    end = perf_counter_ns()
+                    hist.record(end - start)
+                    if interval and end >= next_report[0]:
+                        next_report[0] = end + interval
+                        hist.report()
+            wrapper.histogram = hist
+            return wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Wraps the original function and records its run time into the histogram
+            """
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = perf_counter_ns()
+                hist.record(end - start)
+                if interval and end >= next_report[0]:
+                    next_report[0] = end + interval
+                    hist.report()
+
+        wrapper.histogram = hist
+        return wrapper
+
+    @staticmethod
+    def profile(func=None, *, mode='deterministic', sample_interval=0.001, output=None, output_format=None):
+        """
+        When decorating a function with this decorator, call-graph profiles of the function are collected and
+        aggregated across all calls. Contrary to ``run_time``, the profile shows where time is spent inside the function.
+        The profiler is attached to the decorated function as ``profiler`` (see ``FunctionProfiler``).
+
+        Two modes are available:
+         - "deterministic": traces every function call via ``cProfile``. Exact, but slows down the function considerably.
+         - "sampling": records the function's stack every ``sample_interval`` seconds from a background thread. The
+           overhead does not depend on the number of nested calls which makes it suited for hot functions.
+
+        Example::
+
+        > @Decorators.profile(mode='sampling', output='profiles/foo.txt')
+        > 1 def foo(x):
+        >    ...
+        > 7 foo(10)
+        > 8 foo.profiler.stats().sort_stats('cumulative').print_stats(10)
+        > # at exit, the collapsed stacks are written to profiles/foo.txt
+
+        :param func: function to decorate
+        :param mode: either "deterministic" or "sampling"
+        :type mode: str
+        :param sample_interval: seconds between two samples in the sampling mode
+        :type sample_interval: float
+        :param output: optional file the profile is written to when the interpreter exits
+        :param output_format: either "pstats" or "collapsed". If not given, it is derived from the output's suffix
+        :type output_format: str
+        :return: decorated function which is profiled
+        """
+        if func is None:
+            return partial(Decorators.profile, mode=mode, sample_interval=sample_interval, output=output,
+                           output_format=output_format)
+        assert callable(func)
+        if 'profile' in Decorators._stripped_names:
+            return func
+        profiler = Decorators._function_profiler(func, mode, sample_interval, output, output_format)
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                """
+                Wraps the original coroutine function and profiles its awaited execution
+                """
+                profile = profiler.enter()
+                if profile is not None:
+                    profile.enable()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    if profile is not None:
+                        profile.disable()
+                    profiler.exit(profile)
+            wrapper.profiler = profiler
+            return wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Wraps the original function and profiles its execution
+            """
+            profile = profiler.enter()
+            if profile is not None:
+                profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                profiler.exit(profile)
+
+        wrapper.profiler = profiler
+        return wrapper
+
+    @staticmethod
+    def _function_profiler(func, mode, sample_interval, output, output_format):
+        profiler = FunctionProfiler(func, mode=mode, sample_interval=sample_interval)
+        if output is not None:
+            import atexit
+            atexit.register(profiler.dump, output, output_format)
+        return profiler
+
+    @staticmethod
+    def memoize(func=None, *, max_entries=1024, max_bytes=None, ttl=None, sizeof=getsizeof, max_key_items=64):
+        '''
+        When decorating a function with this decorator, its results are cached in memory. A call with the same
+        arguments returns the cached result without executing the function again. Hence, it is only useful for pure
+        functions. Contrary to ``functools.lru_cache``, the cache can be limited by the size of the results, entries
+        expire after ``ttl`` seconds and unhashable arguments such as lists and dicts are supported. As such arguments
+        are converted into a key on every call, calls with more than ``max_key_items`` items in them are not cached.
+        The cache is attached to the decorated function as ``cache`` (see ``MemoizeCache``). Its statistics are
+        returned by ``foo.cache_info()`` and ``foo.cache_clear()`` drops all entries.
+
+        Example::
+
+        > @Decorators.memoize(max_bytes=50 * 2**20, ttl=600)
+        > 1 def foo(x):
+        >    ...
+        > 7 foo([1, 2])
+        > 8 foo([1, 2])
+        > 9 foo.cache_info()
+        > # returns {'hits': 1, 'misses': 1, 'evictions': 0, 'hit_ratio': 0.5, 'entries': 1, 'bytes': 28}
+
+        :param func: function to decorate
+        :param max_entries: maximum number of cached results. None disables the limit.
+        :type max_entries: int
+        :param max_bytes: maximum size of all cached results in bytes. None disables the limit.
+        :type max_bytes: int
+        :param ttl: seconds after which a cached result expires. None disables the expiry.
+        :type ttl: float
+        :param sizeof: function returning the size of a result in bytes. Defaults to ``sys.getsizeof`` which does not
+            include the size of referenced objects.
+        :param max_key_items: maximum number of items of unhashable arguments (lists, dicts and sets, counted
+            recursively) of a call which is cached
+        :type max_key_items: int
+        :return: decorated function whose results are cached
+        '''
+        if func is None:
+            return partial(Decorators.memoize, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, sizeof=sizeof,
+                           max_key_items=max_key_items)
+        assert callable(func)
+        if 'memoize' in Decorators._stripped_names:
+            return func
+        cache = MemoizeCache(f'{func.__module__}.{func.__qualname__}', max_entries=max_entries, max_bytes=max_bytes,
+                             ttl=ttl, sizeof=sizeof, max_key_items=max_key_items)
+        make_key, freeze, missing = cache.make_key, cache._freeze, MemoizeCache._MISSING
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                """
+                Wraps the original coroutine function and caches its awaited result
+                """
+                key = make_key(args, kwargs)
+                try:
+                    res = cache.get(key, missing)
+                except TypeError:
+                    try:
+                        key = freeze(key)
+                    except TypeError:
+                        return await func(*args, **kwargs)
+                    res = cache.get(key, missing)
+                if res is missing:
+                    res = await func(*args, **kwargs)
+                    cache.put(key, res)
+                return res
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                """
+                Wraps the original function and caches its result
+                """
+                key = make_key(args, kwargs)
+                try:
+                    res = cache.get(key, missing)
+                except TypeError:
+                    try:
+                        key = freeze(key)
+                    except TypeError:
+                        # arguments which can not be converted into a key are not cached
+                        return func(*args, **kwargs)
+                    res = cache.get(key, missing)
+                if res is missing:
+                    res = func(*args, **kwargs)
+                    cache.put(key, res)
+                return res
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    @staticmethod
+    def disk_cache(func=None, *, path='cache/results.sqlite', max_bytes=2**30):
+        '''
+        When decorating a function with this decorator, its results are stored on disk (see ``DiskCache``). A call with
+        the same arguments returns the stored result, also after a restart and from other processes using the same
+        file. The key of a call is a hash of the function's qualified name, its source code and its arguments, so
+        editing the function invalidates its results. Arguments and results have to be picklable, otherwise the call
+        is executed without caching.
+        The cache is attached to the decorated function as ``cache``.
+
+        Example::
+
+        > @Decorators.disk_cache(path='cache/features.sqlite', max_bytes=10 * 2**30)
+        > 1 def foo(x):
+        >    ...
+        > 7 foo(10)
+        > # executes foo and stores its result; calls with x = 10 in later runs read it from disk
+
+        :param func: function to decorate
+        :param path: path of the SQLite database file
+        :param max_bytes: maximum size of all pickled results. The least recently used ones are deleted beyond.
+        :type max_bytes: int
+        :return: decorated function whose results are cached on disk
+        '''
+        if func is None:
+            return partial(Decorators.disk_cache, path=path, max_bytes=max_bytes)
+        assert callable(func)
+        if 'disk_cache' in Decorators._stripped_names:
+            return func
+        cache, lookup, store, missing = Decorators._disk_cache_hooks(func, path, max_bytes)
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                key, res = lookup(args, kwargs)
+                if res is missing:
+                    res = await func(*args, **kwargs)
+                    if key is not None:
+                        store(key, res)
+                return res
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key, res = lookup(args, kwargs)
+                if res is missing:
+                    res = func(*args, **kwargs)
+                    if key is not None:
+                        store(key, res)
+                return res
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    @staticmethod
+    def _disk_cache_hooks(func, path, max_bytes):
+        """
+        Returns the DiskCache of a function, its lookup and store functions and the marker of a missing result.
+        ``lookup(args, kwargs)`` returns the key and the stored result. The key is None if the arguments can not be
+        pickled, in which case the result is not stored either.
+        """
+        import pickle
+        cache = DiskCache(path, max_bytes=max_bytes)
+        func_name, version = f'{func.__module__}.{func.__qualname__}', DiskCache.function_version(func)
+        missing = object()
+
+        def lookup(args, kwargs):
+            try:
+                key = DiskCache.make_key(func_name, version, args, kwargs)
+            except (TypeError, AttributeError, ValueError, RecursionError, pickle.PicklingError):
+                return None, missing
+            return key, cache.get(key, missing)
+
+        def store(key, res):
+            try:
+                cache.put(key, res)
+            except (TypeError, AttributeError, pickle.PicklingError) as e:
+                log.warning(f'Result of "{func.__name__}" could not be cached: {e}')
+
+        return cache, lookup, store, missing
+
+    @staticmethod
+    def show_args(func=None, *, max_length=200, max_depth=3, max_items=10, level=logging.INFO, sampling=None):
+        '''
+        When decorating a function with this decorator, it indicates the arguments passed to the function.
+        The arguments are only rendered if the log level is enabled. Their rendering is bounded (see ``ArgumentRepr``):
+        long containers are truncated and annotated with their length, arrays and data frames are summarized by their
+        shape and dtype and the rendering of args and kwargs is cut at ``max_length`` characters each. For hot
+        functions, a ``LogSampler`` passed as ``sampling`` selects the calls whose arguments are logged.
+
+        Example::
+
+        > @Decorators.show_args
+        > 1 def foo(x):
+        >       ....
+        >    10 foo(10)
+        >    11 #console prints "Executing 'foo' with args (10,) and {}"
+
+        :param func: function to decorate
+        :param max_length: maximum number of characters of the rendered args and kwargs
+        :type max_length: int
+        :param max_depth: maximum nesting depth of rendered containers
+        :type max_depth: int
+        :param max_items: maximum number of rendered items per container
+        :type max_items: int
+        :param level: log level of the message
+        :type level: int
+        :param sampling: optional policy which selects the calls whose arguments are logged
+        :type sampling: LogSampler
+        :return: decorated function which indicates function's arguments
+        '''
+        if func is None:
+            return partial(Decorators.show_args, max_length=max_length, max_depth=max_depth, max_items=max_items,
+                           level=level, sampling=sampling)
+        assert callable(func)
+        if 'show_args' in Decorators._stripped_names:
+            return func
+        render = ArgumentRepr(max_length=max_length, max_depth=max_depth, max_items=max_items).repr
+        sampled = sampling.gate(func, 'show_args') if sampling is not None else None
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                if log.isEnabledFor(level) and (sampled is None or sampled()):
+                    log.log(level, "Executing '%s' with args %s and %s", func.__name__, render(args), render(kwargs),
+                        extra={'function': func.__name__})
+                return await func(*args, **kwargs)
+            return wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if log.isEnabledFor(level) and (sampled is None or sampled()):
+                log.log(level, "Executing '%s' with args %s and %s", func.__name__, render(args), render(kwargs),
+                        extra={'function': func.__name__})
+            ret = func(*args, **kwargs)
+            return ret
+        return wrapper
+
+    @staticmethod
+    def counter(func=None, *, log_calls=True, sampling=None):
+        '''
+        When decorating a function with this decorator, it indicates how often the function has been called.
+        The calls are counted by a ``CounterMetric`` in the module wide ``metrics`` registry which is attached to the
+        decorated function as ``counter``. Its increments are thread-safe and lock free. For hot functions, pass
+        ``log_calls=False`` to only count the calls and read ``foo.counter.value`` or export the registry when needed,
+        or a ``LogSampler`` as ``sampling`` to log the number of calls after a sample of the calls only.
+
+        Example::
+
+         >   @Decorators.counter
+         >   1 def foo(x):
+         >       ....
+         >   10 foo(10)
+         >   11 #console prints "Number of times 'foo' has been called: 1x"
+
+        :param func: function to decorate
+        :param log_calls: if set to True, the number of calls is logged after each call
+        :type log_calls: bool
+        :param sampling: optional policy which selects the calls after which the number of calls is logged
+        :type sampling: LogSampler
+        :return: decorated function which indicates how often the function has been called
+        '''
+        if func is None:
+            return partial(Decorators.counter, log_calls=log_calls, sampling=sampling)
+        assert callable(func)
+        if 'counter' in Decorators._stripped_names:
+            return func
+        count = Decorators._call_counter(func)
+        log_call_count = partial(Decorators._log_call_count, func, count)
+        log_call_count = Decorators._sampled(log_call_count, func, sampling, 'counter')
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                count.inc()
+                res = await func(*args, **kwargs)
+                if log_calls:
+                    log_call_count()
+                return res
+        elif not log_calls:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                count.inc()
+                return func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                count.inc()
+                res = func(*args, **kwargs)
+                log_call_count()
+                return res
+        wrapper.counter = count
+        return wrapper
+
+    @staticmethod
+    def _call_counter(func):
+        return metrics.counter(
+            'function_calls_total', 'Number of calls of functions decorated by Decorators.counter',
+            labels={'function': f'{func.__module__}.{func.__qualname__}'}
+        )
+
+    @staticmethod
+    def _log_call_count(func, count):
+        if log.isEnabledFor(logging.INFO):
+            calls = count.value
+            log.info(f"Number of times '{func.__name__}' has been called: {calls}x",
+                     extra={'function': func.__name__, 'calls': calls})
+
+    @staticmethod
+    def retry(times, delay, *, jitter=None, max_delay=None, deadline=None, circuit_breaker=None):
+        """
+        When decorating a function with this decorator, it tries to execute the function. If the function returns successfully,
+        control is passed to the code right after the function. If however, a function fails to return successfully,
+        it is called once more until trying to successfully finishing it. This procedure is repeated until the functions
+        returns successfully or if it hits the number of limits of retries. Furthermore, the delay parameters adds
+        a sleeping time after each try.
+
+        Target: This decorator is useful for functions which performs requests from/to web applications. For instance, if a server
+        is temporarily unreachable, the request is requested in a fixed delay after the first failure.
+        Example::
+
+        > @Decorators.retry(5,20)
+        > 1 def foo(x):
+        >    ...
+        > 7 foo(10)
+        > # console prints: Trying to execute $foo
+        > # upon failure: stalls 20 seconds and tries a next execution after stalling.
+        > # after 5 tries, it raises an error
+
+        When a downstream service is down for longer, blind retries let every caller sleep through all stalling periods.
+        To fail fast instead, a ``deadline`` limits the total time of a call and a ``circuit_breaker`` (a CircuitBreaker
+        or the name of one shared per target) rejects calls while the target keeps failing (see ``RetryPolicy``).
+        Unlike running out of tries, which returns None, these raise a ``DeadlineExceededError`` or ``CircuitOpenError``.
+
+        > @Decorators.retry(5, 2, jitter='full', deadline=10, circuit_breaker='billing-api')
+        > 1 def foo(x):
+        >    ...
+
+        :param times: how many tries to execute the function
+        :type times: int
+        :param delay: waiting period between two function calls
+        :type delay: int
+        :param jitter: optional randomization of the waiting period, either "full" or "decorrelated"
+        :type jitter: str
+        :param max_delay: optional upper bound of a waiting period in seconds
+        :type max_delay: float
+        :param deadline: optional total time budget of a call in seconds
+        :type deadline: float
+        :param circuit_breaker: optional CircuitBreaker or name of a shared one
+        :return: a decorated function which tries to execute a specified times and sleeps during two failures. The sleeping amount is a function parameter
+        :rtype: func
+        """
+        if 'retry' in Decorators._stripped_names:
+            return Decorators._unchanged
+        return RetryPolicy(times, lambda: repeat(delay), raise_on_failure=False, jitter=jitter, max_delay=max_delay,
+                           deadline=deadline, circuit_breaker=circuit_breaker)
+
+    @staticmethod
+    def retry_with_exponential_stalling(times, white_noise=False, *, jitter=None, max_delay=None, deadline=None,
+                                        circuit_breaker=None):
+        """
+        When decorating a function with this decorator, it tries to execute the function. If the function returns successfully,
+        control is passed to the code right after the function. If however, a function fails to return successfully,
+        it is called once more until trying to successfully finishing it. This procedure is repeated until the functions
+        returns successfully or if it hits the number of limits of retries.
+        After each failure of a function, it is stalled (sleeping). The amount of stalling doubles after each unsuccessful try
+        which implements and exponential stalling time.
+
+        Target: This decorator is useful for functions which performs requests from the Internet. For instance, if a server
+        is temporarily unreachable, the request is requested in a fixed delay after the first failure.
+
+        Example::
+
+        > @Decorators.retry_with_exponential_stalling(5)
+        > 1 def foo(x):
+        >    ...
+        > 7 foo(10)
+        > # console prints: Trying to execute $foo
+        > # upon failure: stalls a multiple of 2 seconds and tries a next execution after stalling.
+        > # after 5 tries, it raises an error
+
+        :param times: how many tries to execute the function
+        :type times: int
+        :param white_noise: if set to True it adds some random values to the stalling period
+        :type white_noise: bool
+        :param jitter: optional randomization of the stalling period, either "full" or "decorrelated". It spreads the
+            tries of many callers better than ``white_noise``.
+        :type jitter: str
+        :param max_delay: optional upper bound of a stalling period in seconds
+        :type max_delay: float
+        :param deadline: optional total time budget of a call in seconds
+        :type deadline: float
+        :param circuit_breaker: optional CircuitBreaker or name of a shared one (see ``Decorators.retry``)
+        :return: a decorated function which tries to execute a specified times and sleeps during two failures. The sleeping time increases exponentially
+        :rtype: func
+        """
+        if 'retry_with_exponential_stalling' in Decorators._stripped_names:
+            return Decorators._unchanged
+
+        def delays():
+            delay = 2 if not white_noise else 2 + random()
+            while True:
+                yield delay
+                delay *= 2
+
+        return RetryPolicy(times, delays, raise_on_failure=True, jitter=jitter, max_delay=max_delay, deadline=deadline,
+                           circuit_breaker=circuit_breaker)
+
+    @staticmethod
+    def accepted_arguments(accepted_args:list):
+        '''
+        When decorating a function with this decorator, the function's arguments are checked against a list of valid arguments.
+        If an invalid argument is encoutered, the function is not executed. Hashable accepted arguments are looked up in
+        a frozenset. Arguments passed by keyword are checked as well.
+
+        Example::
+
+        > @Decorators.accepted_arguments([0,1])
+        > 1 def foo(x):
+        >    ...
+        > 7 foo(10)
+        > # console prints: Encountered a non-valid argument.
+        > # console prints: Valid arguments are: [0,1]
+
+        :param accepted_args: list of accepted arguments by the function
+        :type accepted_args: list
+        :return: a decorated function which checks the aguments
+        '''
+        if 'accepted_arguments' in Decorators._stripped_names:
+            return Decorators._unchanged
+        return Decorators._check_decorator(lambda func: ArgumentValidator.compile_membership(accepted_args))
+
+    @staticmethod
+    def accepted_arguments_within_class_methods(accepted_args):
+        '''
+        When decorating a function with this decorator, the function's arguments are checked against a list of valid arguments.
+        If an invalid argument is encountered, the function is not executed. This decorator is basically the same as "accepted_arguments"
+        decorator except that it is aimed for functions within classes (i.e. containing a "self" parameter). In these setup, the class instance
+        itself is passed as the first argument. Therefore, this Decorator only checks the second till last argument for correctness.
+
+        Example::
+
+        > 1 class Foo:
+        > 2   ...
+        > ...
+        > 10   @Decorators.accepted_arguments_within_class_methods([0,1])
+        > 11   def bar(self):
+        > 12         ...
+        > ...
+        > 18 foo=Foo(1)
+        > 19 foo.bar()
+        > # console prints: Encountered a non-valid argument.
+        > # console prints: Valid arguments are: [0,1]
+
+        :param accepted_args: list of accepted arguments by the function
+        :type accepted_args: list
+        :return: a decorated function which checks the aguments
+        '''
+        if 'accepted_arguments_within_class_methods' in Decorators._stripped_names:
+            return Decorators._unchanged
+        return Decorators._check_decorator(lambda func: ArgumentValidator.compile_membership(accepted_args, skip=1))
+
+    @staticmethod
+    def accepted_argument_types(*decorator_args):
+        '''
+        When decorating a function with this decorator, the function's arguments types are checked against a list of valid types.
+        The types are provided in the same order as the corresponding arguments such that they match.
+        The types are bound to the parameter names once, so arguments passed by keyword are checked as well
+        (see ``ArgumentValidator``).
+
+        Example::
+
+        > @Decorators.accepted_argument_types(str,str)
+        > 1 def foo(x,y):
+        >    ...
+        > 7 foo(10,5)
+        > # console prints: Argument Types do not match expected types.
+        > # console prints: Expected <class 'str'> for "x" but got <class 'int'>
+
+        :param decorator_args: expected types of the positional parameters
+        :return: a decorated function which checks the argument types
+        '''
+        if 'accepted_argument_types' in Decorators._stripped_names:
+            return Decorators._unchanged
+        return Decorators._check_decorator(
+            lambda func: ArgumentValidator.compile(func, positional_types=decorator_args)
+        )
+
+    @staticmethod
+    def validate(func=None, *, types=None, values=None):
+        '''
+        When decorating a function with this decorator, its arguments are checked against expected types and valid
+        values per parameter. Without ``types``, the function's type annotations are checked. The check is generated
+        once when the function is decorated (see ``ArgumentValidator``), so validating a call costs little more than
+        the call itself.
+
+        Example::
+
+        > @Decorators.validate(values={'mode': ('fast', 'exact')})
+        > 1 def foo(x: int, mode: str = 'fast'):
+        >    ...
+        > 7 foo(10, mode='slow')
+        > # raises: Encountered a non-valid argument for "mode": 'slow'.
+
+        :param func: function to decorate
+        :param types: optional mapping of parameter names to expected types. Defaults to the type annotations.
+        :type types: dict
+        :param values: optional mapping of parameter names to collections of valid values
+        :type values: dict
+        :return: a decorated function which checks its arguments
+        '''
+        if func is None:
+            return partial(Decorators.validate, types=types, values=values)
+        assert callable(func)
+        if 'validate' in Decorators._stripped_names:
+            return func
+        return Decorators._checked(func, ArgumentValidator.compile(func, types=types, values=values))
+
+    @staticmethod
+    def parallel_map(func=None, *, executor='thread', max_workers=None, chunk_size=None, max_in_flight=None,
+                     ordered=True, retry=None, return_exceptions=False):
+        '''
+        When decorating a function of a single item with this decorator, it takes an iterable of items instead and
+        executes the function for them in a thread or process pool. The decorated function returns an iterator which
+        streams the results while the items are processed:
+         - the items are read lazily and submitted in chunks. Without ``chunk_size``, sized iterables are split into
+           about four chunks per worker and other iterables into chunks which double from 1 up to 256 items.
+         - at most ``max_in_flight`` chunks (default: two per worker) are submitted and not yet consumed, so neither
+           the items nor the results pile up in memory if the consumer is slower than the workers
+         - the results are yielded in the order of the items or, with ``ordered=False``, as soon as they are ready
+
+        Exceptions of single items do not stop the others. They are raised together as ``ParallelMapError`` after all
+        other results or, with ``return_exceptions=True``, yielded in place of the results. ``retry`` takes one of the
+        retry decorators (e.g. ``Decorators.retry(3, 1)``) to retry failing items in the workers first.
+
+        Process workers look the function up by its module and name, as the original function is replaced by the
+        decorated one. Hence, the function has to be defined at module level and decorated with the ``@`` syntax.
+
+        Example::
+
+        > @Decorators.parallel_map(executor='process', retry=Decorators.retry(3, 1))
+        > 1 def score(document, model='small'):
+        >    ...
+        > 7 for result in score(documents, model='large'):
+        >    ...
+
+        :param func: function to decorate
+        :param executor: "thread", "process" or an existing ``concurrent.futures.Executor`` which is not shut down
+        :param max_workers: number of workers of the pool
+        :type max_workers: int
+        :param chunk_size: optional number of items per task
+        :type chunk_size: int
+        :param max_in_flight: maximum number of submitted chunks whose results have not been yielded yet
+        :type max_in_flight: int
+        :param ordered: if set to True, the results are yielded in the order of the items
+        :type ordered: bool
+        :param retry: optional retry decorator applied to the function in the workers
+        :param return_exceptions: if set to True, exceptions of failed items are yielded instead of raised
+        :type return_exceptions: bool
+        :return: decorated function which takes an iterable of items and further arguments passed to every call
+        '''
+        if func is None:
+            return partial(Decorators.parallel_map, executor=executor, max_workers=max_workers, chunk_size=chunk_size,
+                           max_in_flight=max_in_flight, ordered=ordered, retry=retry,
+                           return_exceptions=return_exceptions)
+        assert callable(func)
+        from concurrent.futures import ProcessPoolExecutor
+        if iscoroutinefunction(func):
+            raise TypeError(f'"{func.__name__}" is a coroutine function, parallel_map runs functions in a pool')
+        if isinstance(executor, str) and executor not in ('thread', 'process'):
+            raise ValueError(f'Unknown executor "{executor}". Valid executors are: thread, process')
+        call = func
+        if retry is not None:
+            if isinstance(retry, RetryPolicy):
+                # failed items have to be reported instead of returning None
+                from copy import copy
+                retry = copy(retry)
+                retry.raise_on_failure = True
+            call = retry(func)
+        if executor == 'process' or isinstance(executor, ProcessPoolExecutor):
+            if '<' in func.__qualname__:
+                raise ValueError(f'"{func.__qualname__}" can not be looked up by process workers, it has to be defined '
+                                 f'at module level')
+            task = partial(Decorators._map_chunk_by_reference, func.__module__, func.__qualname__)
+        else:
+            task = partial(Decorators._map_chunk, call)
+
+        @wraps(func)
+        def wrapper(items, *args, **kwargs):
+            return Decorators._parallel_results(
+                task, items, args, kwargs, executor, max_workers, chunk_size, max_in_flight, ordered, return_exceptions
+            )
+        # copied onto decorators stacked above by ``wraps``, so process workers find it via the module attribute
+        wrapper._call_item = call
+        return wrapper
+
+    @staticmethod
+    def _map_chunk(call, chunk, args, kwargs):
+        """
+        Calls the function for every item of a chunk. Returns for each item if it succeeded and its result or exception.
+        """
+        outcomes = []
+        for item in chunk:
+            try:
+                outcomes.append((True, call(item, *args, **kwargs)))
+            except Exception as e:
+                outcomes.append((False, e))
+        return outcomes
+
+    @staticmethod
+    def _map_chunk_by_reference(module, qualname, chunk, args, kwargs):
+        """
+        Runs ``_map_chunk`` in a process worker with the per item function of the decorated function found in the
+        worker's own import of the module.
+        """
+        from importlib import import_module
+        target = import_module(module)
+        for name in qualname.split('.'):
+            target = getattr(target, name)
+        return Decorators._map_chunk(getattr(target, '_call_item', target), chunk, args, kwargs)
+
+    @staticmethod
+    def _chunks(items, chunk_size, workers):
+        """
+        Splits the items lazily into lists (see ``parallel_map``).
+        """
+        if chunk_size is None:
+            try:
+                chunk_size = max(1, -(-len(items) // (4 * workers)))
+            except TypeError:
+                pass
+        items = iter(items)
+        size = chunk_size or 1
+        while True:
+            chunk = list(islice(items, size))
+            if not chunk:
+                return
+            yield chunk
+            if not chunk_size:
+                size = min(2 * size, 256)
+
+    @staticmethod
+    def _parallel_results(task, items, args, kwargs, executor, max_workers, chunk_size, max_in_flight, ordered,
+                          return_exceptions):
+        """
+        Generates the results of ``parallel_map``. The pool is only started once the results are iterated.
+        """
+        from collections import deque
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+        if isinstance(executor, str):
+            pool = (ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor)(max_workers)
+        else:
+            pool = executor
+        workers = max_workers or getattr(pool, '_max_workers', None) or 1
+        max_in_flight = max_in_flight or 2 * workers
+        chunks = Decorators._chunks(items, chunk_size, workers)
+        # submitted futures with the index of their first item and their chunk and, if ordered, in submission order
+        futures, submitted, errors = {}, deque(), []
+
+        def submit():
+            index = 0
+            for chunk in chunks:
+                future = pool.submit(task, chunk, args, kwargs)
+                futures[future] = index, chunk
+                if ordered:
+                    submitted.append(future)
+                index += len(chunk)
+                yield
+        submitting = submit()
+
+        try:
+            for _ in islice(submitting, max_in_flight):
+                pass
+            while futures:
+                if ordered:
+                    done = [submitted.popleft()]
+                else:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, chunk = futures.pop(future)
+                    outcomes = future.result()
+                    # keep the workers busy while the consumer handles the results
+                    for _ in islice(submitting, max_in_flight - len(futures)):
+                        pass
+                    for offset, (succeeded, value) in enumerate(outcomes):
+                        if succeeded or return_exceptions:
+                            yield value
+                        else:
+                            errors.append((index + offset, chunk[offset], value))
+        finally:
+            for future in futures:
+                future.cancel()
+            if pool is not executor:
+                pool.shutdown()
+        if errors:
+            raise ParallelMapError(errors)
+
+    @staticmethod
+    def compose(*decorators):
+        '''
+        Combines several decorators into a single one which generates one wrapper for all of them (see
+        ``WrapperFusion``). Decorating a function with the composition is the same as stacking the decorators in the
+        given order, i.e. the first one is the outermost. However, a call executes a single wrapper frame and passes
+        the arguments on once instead of once per decorator.
+
+        The decorators of this class are fused, with or without their parameters. Other decorators are applied as
+        usual around the fused parts, as are retries with a deadline of coroutine functions (the try has to run as
+        a separate task to be cancelled at the deadline).
+
+        Example::
+
+        > @Decorators.compose(Decorators.run_time, Decorators.counter(log_calls=False), Decorators.show_args,
+        >                     Decorators.accepted_argument_types(int), Decorators.retry(3, 1))
+        > 1 def foo(x):
+        >    ...
+        > 7 foo(10)
+        > # same logs and checks as the five stacked decorators, foo.counter counts the calls
+
+        :param decorators: decorators in the order they would be stacked
+        :return: a decorator which generates the fused wrapper
+        '''
+        def decorator(func):
+            assert callable(func)
+            stages = []
+            for dec in reversed(decorators):
+                stage = Decorators._stage_of(dec, func)
+                if stage is None:
+                    func = dec(Decorators._fuse(func, stages))
+                    stages = []
+                else:
+                    stages.insert(0, stage)
+            return Decorators._fuse(func, stages)
+        return decorator
+
+    @staticmethod
+    def _stage_of(decorator, func):
+        """
+        Returns the function adding the decorator's stage to a ``WrapperFusion`` or None if it can not be fused.
+        Decorators of this class are looked up by name, e.g. ``Decorators.run_time`` or the partial returned by
+        ``Decorators.run_time(histogram=True)`` by ``_run_time_stage``.
+        """
+        if decorator is Decorators._unchanged:
+            return lambda fusion: None
+        if isinstance(decorator, RetryPolicy):
+            if decorator.deadline is not None and iscoroutinefunction(func):
+                return None
+            return partial(Decorators._retry_policy_stage, policy=decorator)
+        stage = getattr(decorator, '_stage', None)
+        if stage is not None:
+            return stage
+        options = {}
+        if isinstance(decorator, partial):
+            decorator, options = decorator.func, decorator.keywords
+        name = getattr(decorator, '__name__', '')
+        builder = getattr(Decorators, f'_{name}_stage', None)
+        if builder is None or getattr(Decorators, name, None) != decorator:
+            return None
+        if name in Decorators._stripped_names:
+            return lambda fusion: None
+        return partial(builder, **options)
+
+    @staticmethod
+    def _fuse(func, stages):
+        fusion = WrapperFusion(func)
+        for stage in stages:
+            stage(fusion)
+        return fusion.build() if fusion.stages else func
+
+    @staticmethod
+    def _run_time_stage(fusion, histogram=False, report_interval=None, sampling=None):
+        if not histogram:
+            log_run_time = partial(Decorators._log_run_time, fusion.func)
+            fusion.add(
+                ('_start{i} = _perf_ns()', '{body}', '_log_run_time{i}(_perf_ns() - _start{i})'),
+                {'_log_run_time{i}': Decorators._sampled(log_run_time, fusion.func, sampling, 'run_time')}
+            )
+            return
+        hist = Decorators._duration_histogram(fusion.func)
+        perf_counter_ns = time.perf_counter_ns
+        interval = int(report_interval * 1e9) if report_interval else None
+        next_report = [perf_counter_ns() + interval] if interval else None
+
+        def record(start):
+            end = perf_counter_ns()
+            hist.record(end - start)
+            if interval and end >= next_report[0]:
+                next_report[0] = end + interval
+                hist.report()
+
+        fusion.add(
+            ('_start{i} = _perf_ns()', 'try:', '    {body}', 'finally:', '    _record{i}(_start{i})'),
+            {'_record{i}': record}, {'histogram': hist}
+        )
+
+    @staticmethod
+    def _profile_stage(fusion, mode='deterministic', sample_interval=0.001, output=None, output_format=None):
+        profiler = Decorators._function_profiler(fusion.func, mode, sample_interval, output, output_format)
+        fusion.add(
+            ('_profile{i} = _profiler{i}.enter()', 'if _profile{i} is not None:', '    _profile{i}.enable()', 'try:',
+             '    {body}', 'finally:', '    if _profile{i} is not None:', '        _profile{i}.disable()',
+             '    _profiler{i}.exit(_profile{i})'),
+            {'_profiler{i}': profiler}, {'profiler': profiler}
+        )
+
+    @staticmethod
+    def _cache_stage(fusion, cache, lookup, store, missing):
+        fusion.add(
+            ('_key{i}, _res = _lookup{i}(args, kwargs)', 'if _res is _missing{i}:', '    {body}',
+             '    if _key{i} is not None:', '        _store{i}(_key{i}, _res)'),
+            {'_lookup{i}': lookup, '_store{i}': store, '_missing{i}': missing},
+            {'cache': cache, 'cache_info': cache.info, 'cache_clear': cache.clear}
+        )
+
+    @staticmethod
+    def _memoize_stage(fusion, max_entries=1024, max_bytes=None, ttl=None, sizeof=getsizeof, max_key_items=64):
+        func = fusion.func
+        cache = MemoizeCache(f'{func.__module__}.{func.__qualname__}', max_entries=max_entries, max_bytes=max_bytes,
+                             ttl=ttl, sizeof=sizeof, max_key_items=max_key_items)
+        make_key, freeze, missing = cache.make_key, cache._freeze, MemoizeCache._MISSING
+
+        def lookup(args, kwargs):
+            key = make_key(args, kwargs)
+            try:
+                return key, cache.get(key, missing)
+            except TypeError:
+                try:
+                    key = freeze(key)
+                except TypeError:
+                    return None, missing
+                return key, cache.get(key, missing)
 
-    All the functions defined inside this class take a function as an input and return a decorated function.
-    """
+        Decorators._cache_stage(fusion, cache, lookup, cache.put, missing)
 
     @staticmethod
-    def run_time(func):
-        """
-        When decorating a function with this decorator, it indicates the function's run time in a hh:mm:ss after
-        the function returns.
+    def _disk_cache_stage(fusion, path='cache/results.sqlite', max_bytes=2**30):
+        Decorators._cache_stage(fusion, *Decorators._disk_cache_hooks(fusion.func, path, max_bytes))
 
-        Example::
+    @staticmethod
+    def _show_args_stage(fusion, max_length=200, max_depth=3, max_items=10, level=logging.INFO, sampling=None):
+        func = fusion.func
+        render = ArgumentRepr(max_length=max_length, max_depth=max_depth, max_items=max_items).repr
+        sampled = sampling.gate(func, 'show_args') if sampling is not None else None
 
-        > # Assume the function needs exactly 1 minute, 13.534 seconds to execute
-        > @Decorators.run_time
-        > 1 def foo(x):
-        > 2   ...
-        > ...
-        > 7 foo(10)
-        > #console prints "00:01:13,534"
+        def show_args(args, kwargs):
+            if log.isEnabledFor(level) and (sampled is None or sampled()):
+                log.log(level, "Executing '%s' with args %s and %s", func.__name__, render(args), render(kwargs),
+                        extra={'function': func.__name__})
 
-        :param func: function to decorate
-        :return: decorated function which indicates function run time
+        fusion.add(('_show_args{i}(args, kwargs)', '{body}'), {'_show_args{i}': show_args})
+
+    @staticmethod
+    def _counter_stage(fusion, log_calls=True, sampling=None):
+        count = Decorators._call_counter(fusion.func)
+        log_call_count = Decorators._sampled(
+            partial(Decorators._log_call_count, fusion.func, count), fusion.func, sampling, 'counter'
+        )
+        code = ('_count{i}.inc()', '{body}') + (('_log_call_count{i}()',) if log_calls else ())
+        fusion.add(code, {'_count{i}': count, '_log_call_count{i}': log_call_count}, {'counter': count})
+
+    @staticmethod
+    def _retry_policy_stage(fusion, policy):
+        fusion.add(
+            ('_delays{i}, _deadline{i} = _policy{i}._start()',
+             'for _attempt{i} in _attempts{i}:',
+             '    _policy{i}._before_try(_func)',
+             '    try:',
+             '        _policy{i}._log_try(_func, _attempt{i})',
+             '        {body}',
+             '    except Exception as _error{i}:',
+             '        _delay{i} = _policy{i}._failed(_func, _attempt{i}, _error{i}, _delays{i}, _deadline{i})',
+             '        if _delay{i} is None:',
+             '            _res = None',
+             '            break',
+             '        {await}_sleep(_delay{i})',
+             '    except BaseException:',
+             '        _policy{i}._aborted()',
+             '        raise',
+             '    else:',
+             '        _policy{i}._succeeded(_func, _attempt{i})',
+             '        break'),
+            {'_policy{i}': policy, '_attempts{i}': range(1, policy.times + 1)}
+        )
+
+    @staticmethod
+    def _validate_stage(fusion, types=None, values=None):
+        Decorators._check_stage(fusion, ArgumentValidator.compile(fusion.func, types=types, values=values))
+
+    @staticmethod
+    def _check_stage(fusion, check):
+        if check is not None:
+            fusion.add(('_check{i}(*args, **kwargs)', '{body}'), {'_check{i}': check})
+
+    @staticmethod
+    def _attribute_stage(fusion, attribute):
+        fusion.add(
+            ('if _has_attr{i}(args[0]):', '    {body}', 'else:', '    _missing_attr{i}(args[0], _attribute{i})'),
+            {'_has_attr{i}': partial(ClassAttrHandler.has_deep_attr, attrs=attribute),
+             '_missing_attr{i}': Decorators._log_missing_attribute, '_attribute{i}': attribute}
+        )
+
+    @staticmethod
+    def _container_non_empty_stage(fusion):
+        fusion.add(('args = _check_containers{i}(args)', '{body}'),
+                   {'_check_containers{i}': Decorators._check_containers})
+
+    @staticmethod
+    def _check_decorator(make_check):
         """
-        assert callable(func)
+        Returns a decorator which checks the arguments with the check ``make_check(func)`` compiles for a function.
+        """
+        def decorator(func):
+            return Decorators._checked(func, make_check(func))
+        decorator._stage = lambda fusion: Decorators._check_stage(fusion, make_check(fusion.func))
+        return decorator
+
+    @staticmethod
+    def _checked(func, check):
+        """
+        Returns a function which calls ``check`` with the arguments before calling ``func``.
+        """
+        if check is None:
+            return func
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                check(*args, **kwargs)
+                return await func(*args, **kwargs)
+            return wrapper
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            """
-            Wraps the original function and adds the decorator's run time display functionality
-            """
-            start = time.time()
-            ret = func(*args, **kwargs)
-            end = time.time()
-            m, s = divmod(end - start, 60)
-            h, m = divmod(m, 60)
-            ms = int(s % 1 * 1000)
-            s, m, h = int(round(s, 0)), int(round(m, 0)), int(round(h, 0))
-            log.info(
-                f'Execution Time (hh:mm:sec) for function "{func.__name__}": {h:02d}:{m:02d}:{s:02d},{ms:03d}'
-            )
-            return ret
-
+            check(*args, **kwargs)
+            return func(*args, **kwargs)
         return wrapper
 
     @staticmethod
-    def show_args(func):
+    def class_object_has_attr(attribute):
         '''
-        When decorating a function with this decorator, it indicates the arguments passed to the function.
+        When decorating a class method with this function, it checks if the class instance has a given attribute.
+        It allows chaining to get deep levels of attributes. Note that this decorator can only be used by class methods.
 
-        Example::
+        :param attribute: name of the attribute. Nested attributes are separated by dots, e.g. "config.path".
+        :type attribute: str
+        :return: decorator whose functions are only executed if their first argument has the attribute
+        '''
+        if 'class_object_has_attr' in Decorators._stripped_names:
+            return Decorators._unchanged
+        has_attr = partial(ClassAttrHandler.has_deep_attr, attrs=attribute)
 
-        > @Decorators.show_args
-        > 1 def foo(x):
-        >       ....
-        >    10 foo(10)
-        >    11 #console prints "Executing 'foo' with args 10 and ''"
+        def decorator(func):
+            if iscoroutinefunction(func):
+                @wraps(func)
+                async def wrapper(*args, **kwargs):
+                    if has_attr(args[0]):
+                        return await func(*args, **kwargs)
+                    Decorators._log_missing_attribute(args[0], attribute)
+                return wrapper
 
-        :param func: function to decorate
-        :return: decorated function which indicates function's arguments
-        '''
-        assert callable(func)
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log.info(f"Executing '{func.__name__}' with args {args} and {kwargs}")
-            ret = func(*args, **kwargs)
-            return ret
-        return wrapper
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if has_attr(args[0]):
+                    return func(*args, **kwargs)
+                Decorators._log_missing_attribute(args[0], attribute)
+            return wrapper
+        decorator._stage = partial(Decorators._attribute_stage, attribute=attribute)
+        return decorator
 
     @staticmethod
-    def counter(func):
+    def _log_missing_attribute(obj, attribute):
+        log.error(f"The object '{obj}' does not have the required attribute {attribute}.")
+
+    @classmethod
+    def container_non_empty(cls, func):
         '''
-        When decorating a function with this decorator, it indicates how often the function has been called.
+        When decorating a function with this decorator, the function checks if the object is not empy.
+        Every positional argument which is a container is checked: built-in containers by their length, pandas objects
+        by ``empty``, NumPy arrays by ``size`` and other sized objects by ``len``. Further types can be added via
+        ``register_emptiness_check``. Iterators and generators are checked by peeking at their first item. Hence, they
+        are neither consumed nor materialised, but the function receives an iterator over all items instead of the
+        original one.
 
         Example::
 
-         >   @Decorators.counter
-         >   1 def foo(x):
-         >       ....
-         >   10 foo(10)
-         >   11 #console prints "Executing 'foo' with args 10 and ''"
+        > @Decorators.container_non_empty
+        > 1 def foo(x):
+        >    ...
+        > 7 foo('')
+        > # raises IndexError: Container  is empty
 
         :param func: function to decorate
-        :return: decorated function which indicates how often the function has been called
+        :return: decorated function which checks that its container arguments are not empty
         '''
-        assert callable(func)
+        if 'container_non_empty' in cls._stripped_names:
+            return func
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                args = cls._check_containers(args)
+                return await func(*args, **kwargs)
+            return wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            wrapper.count = wrapper.count + 1
-            res = func(*args, **kwargs)
-            log.info(f"Number of times '{func.__name__}' has been called: {wrapper.count}x")
-            return res
-        wrapper.count = 0
+            args = cls._check_containers(args)
+            result = func(*args, **kwargs)
+            return result
+
         return wrapper
 
-    @staticmethod
-    def retry(times, delay):
+    @classmethod
+    def register_emptiness_check(cls, obj_type, is_empty):
         """
-        When decorating a function with this decorator, it tries to execute the function. If the function returns successfully,
-        control is passed to the code right after the function. If however, a function fails to return successfully,
-        it is called once more until trying to successfully finishing it. This procedure is repeated until the functions
-        returns successfully or if it hits the number of limits of retries. Furthermore, the delay parameters adds
-        a sleeping time after each try.
+        Registers how ``container_non_empty`` checks arguments of a type and its subclasses.
 
-        Target: This decorator is useful for functions which performs requests from/to web applications. For instance, if a server
-        is temporarily unreachable, the request is requested in a fixed delay after the first failure.
-        Example::
+        :param obj_type: type of the arguments
+        :param is_empty: function returning True if an argument is empty, or None if arguments of the type are not
+            checked at all
+        """
+        cls._EMPTINESS_CHECKS[obj_type] = is_empty
+        cls._emptiness_check_cache.clear()
 
-        > @Decorators.retry(5,20)
-        > 1 def foo(x):
-        >    ...
-        > 7 foo(10)
-        > # console prints: Trying to execute $foo
-        > # upon failure: stalls 20 seconds and tries a next execution after stalling.
-        > # after 5 tries, it raises an error
+    @classmethod
+    def _check_containers(cls, args):
+        """
+        Raises an IndexError if one of the arguments is an empty container. Returns the arguments, in which iterators
+        are replaced by iterators over the peeked item and the remaining ones.
+        """
+        cache = cls._emptiness_check_cache
+        for index, argument in enumerate(args):
+            obj_type = type(argument)
+            try:
+                is_empty = cache[obj_type]
+            except KeyError:
+                is_empty = cache[obj_type] = cls._emptiness_check(obj_type)
+            if is_empty is None:
+                continue
+            if is_empty is cls._PEEK:
+                first = next(argument, cls._PEEK)
+                if first is cls._PEEK:
+                    raise IndexError(f'Container {argument} is empty')
+                args = args[:index] + (chain((first,), argument),) + args[index + 1:]
+            elif is_empty(argument):
+                raise IndexError(f'Container {argument} is empty')
+        return args
 
-        :param times: how many tries to execute the function
-        :type times: int
-        :param delay: waiting period between two function calls
-        :type delay: int
-        :return: a decorated function which tries to execute a specified times and sleeps during two failures. The sleeping amount is a function parameter
-        :rtype: func
+    @classmethod
+    def _emptiness_check(cls, obj_type):
         """
+        Returns the function which checks if an object of the given type is empty, ``_PEEK`` for iterators and None
+        if the type is no container. The registered types are looked up along the method resolution order (and as
+        abstract base classes), then the protocols are tried: ``empty`` (pandas), ``size`` (NumPy), ``__len__``, ``__next__`` and ``__iter__``.
 
-        def decorator(func):
-            """
-            Wraps decorator arguments
-            """
+        :param obj_type: type of the object
+        """
+        for base in obj_type.__mro__:
+            if base in cls._EMPTINESS_CHECKS:
+                return cls._EMPTINESS_CHECKS[base]
+        for registered, is_empty in cls._EMPTINESS_CHECKS.items():
+            # abstract base classes such as io.IOBase are not part of the method resolution order
+            if issubclass(obj_type, registered):
+                return is_empty
+        if not hasattr(obj_type, '__iter__') and not hasattr(obj_type, '__len__'):
+            return None
+        if hasattr(obj_type, 'empty'):
+            return cls._empty_attribute
+        if hasattr(obj_type, 'size'):
+            return cls._size_attribute
+        if hasattr(obj_type, '__len__'):
+            return cls._zero_length
+        if hasattr(obj_type, '__next__'):
+            return cls._PEEK
+        return cls._no_first_item
 
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                """
-                Wraps the original function and adds the decorator's retry functionality
-                """
-                t = 1
-                while t <= times:
-                    try:
-                        log.info(f'Trying to execute "{func.__name__}" ({t}/{times})')
-                        res = func(*args, **kwargs)
-                        log.info(f'Successfully executed "{func.__name__}".')
-                        return res
-                    except Exception as e:
-                        log.warning("Execution failed for the following reason:", e)
-                        t += 1
-                        if t <= times:
-                            time.sleep(delay)
-                        else:
-                            log.error(
-                                f'Function "{func.__name__}" could not be executed after {times} tries'
-                            )
+    @staticmethod
+    def _empty_attribute(obj):
+        empty = obj.empty
+        return empty() if callable(empty) else bool(empty)
 
-            return wrapper
+    @staticmethod
+    def _size_attribute(obj):
+        size = obj.size
+        return (size() if callable(size) else size) == 0
 
-        return decorator
+    @staticmethod
+    def _zero_length(obj):
+        return len(obj) == 0
 
     @staticmethod
-    def retry_with_exponential_stalling(times, white_noise=False):
-        """
-        When decorating a function with this decorator, it tries to execute the function. If the function returns successfully,
-        control is passed to the code right after the function. If however, a function fails to return successfully,
-        it is called once more until trying to successfully finishing it. This procedure is repeated until the functions
-        returns successfully or if it hits the number of limits of retries.
-        After each failure of a function, it is stalled (sleeping). The amount of stalling doubles after each unsuccessful try
-        which implements and exponential stalling time.
+    def _no_first_item(obj):
+        return next(iter(obj), Decorators._PEEK) is Decorators._PEEK
 
-        Target: This decorator is useful for functions which performs requests from the Internet. For instance, if a server
-        is temporarily unreachable, the request is requested in a fixed delay after the first failure.
 
-        Example::
+Decorators._set_production_mode_from_environment()
 
-        > @Decorators.retry_with_exponential_stalling(5)
-        > 1 def foo(x):
-        >    ...
-        > 7 foo(10)
-        > # console prints: Trying to execute $foo
-        > # upon failure: stalls a multiple of 2 seconds and tries a next execution after stalling.
-        > # after 5 tries, it raises an error
 
-        :param times: how many tries to execute the function
-        :type times: int
-        :param white_noise: if set to True it adds some random values to the stalling period
-        :type white_noise: bool
-        :return: a decorated function which tries to execute a specified times and sleeps during two failures. The sleeping time increases exponentially
-        :rtype: func
+class Dict_to_Obj:
+    '''
+    This class constructs an object notation out of a dictionary. Nested dictionaries, also within lists and tuples,
+    are converted as well.
+
+    Converting many dictionaries with the same keys is cheap: for every key shape (the keys in their order) which
+    recurs, a subclass with the keys as ``__slots__`` and a function filling them are generated once and cached. A
+    conversion is then a single call and the object stores its attributes in a compact slot layout. Keys which are no
+    valid attribute names (e.g. "first-name" or "class") are stored in the ``__dict__`` and can be read via ``getattr``.
+    Only the ``_MAX_SHAPES`` most recently used shapes are cached. Dictionaries whose shape was not seen before or
+    whose keys are not all strings (e.g. dictionaries keyed by ids) are converted into an object storing all
+    attributes in its ``__dict__``, so such keys do not accumulate generated classes. Either way, the object has a
+    ``__dict__`` and accepts further attributes, so it behaves the same whether its shape was converted before or
+    not. Keys are converted into attribute names via ``str``. Keys with the same name (e.g. 1 and "1") are rejected
+    with a ValueError.
+
+    Example::
+
+    > foo = Dict_to_Obj({'a': 1, 'b': {'c': [{'d': 2}]}})
+    > foo.b.c[0].d
+    > # returns 2
+    '''
+    __slots__ = ()
+    # types of values which are not converted. Further ones are added when they are encountered the first time.
+    _ATOMIC = {str, int, float, bool, type(None)}
+    _MAX_SHAPES = 1024
+    _builders = OrderedDict()
+    _seen_shapes = OrderedDict()
+
+    def __new__(cls, d):
+        return cls._build_function(tuple(d))(d)
+
+    @classmethod
+    def _build_function(cls, keys, recurring=False):
         """
+        Returns the function converting dictionaries with the given keys. Shapes are cached in least recently used
+        order. Only keys which are exactly of type ``str`` are cached, so keys of a cached shape never differ in type
+        from the keys of a dictionary sharing it (as 1 and True would). A class is generated on the second occurrence
+        of a shape, or on the first one if ``recurring`` is True.
+        """
+        builders = cls._builders
+        build = builders.get(keys)
+        if build is not None:
+            try:
+                builders.move_to_end(keys)
+            except KeyError:
+                # evicted by another thread in the meantime
+                pass
+            return build
+        if not all(type(key) is str for key in keys):
+            return _build_unshaped
+        if not recurring and cls._seen_shapes.pop(keys, None) is None:
+            cls._remember_shape(cls._seen_shapes, keys, True)
+            return _build_unshaped
+        build = cls._builder(keys)
+        cls._remember_shape(builders, keys, build)
+        return build
 
-        def decorator(func):
-            """
-            Wraps decorator arguments
-            """
+    @classmethod
+    def _remember_shape(cls, shapes, keys, value):
+        shapes[keys] = value
+        while len(shapes) > cls._MAX_SHAPES:
+            try:
+                shapes.popitem(last=False)
+            except KeyError:
+                break
 
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                """
-                Wraps the original function and adds the decorator's retry with exponential stalling functionality
-                """
-                t, delay = 1, 2 if not white_noise else 2 + random()
-                while t <= times:
-                    try:
-                        log.info(f'Trying to execute "{func.__name__}" ({t}/{times})')
-                        res = func(*args, **kwargs)
-                        log.info(f'Successfully executed "{func.__name__}".')
-                        return res
-                    except Exception as e:
-                        log.warning("Execution failed for the following reason:", e)
-                        t += 1
-                        if t <= times:
-                            log.info(
-                                f"Stalling {round(delay, 3)} secs before next execution try."
-                            )
-                            time.sleep(delay)
-                            delay *= 2
-                        else:
-                            log.error(
-                                f'Function "{func.__name__}" could not be executed after {times} tries'
-                            )
-                            raise FunctionNotExecutedError(f'Function "{func.__name__}" could not be executed after {times} tries for the following reason: {e}')
+    @classmethod
+    def _builder(cls, keys):
+        """
+        Generates the subclass for dictionaries with the given keys and returns the function which converts them.
+        """
+        from keyword import iskeyword
+        slots, names, body = [], [], []
+        for index, key in enumerate(keys):
+            name = str(key)
+            if name.isidentifier() and not iskeyword(name) and not name.startswith('__') and name not in slots:
+                slots.append(name)
+                target = f'self.{name}'
+            else:
+                target = f'self.__dict__[{name!r}]'
+            names.append(name)
+            body.append(f'    {target} = _v{index} if type(_v{index}) in _ATOMIC else _convert(_v{index})')
+        # the objects accept further attributes like the ones of shapes which have no class (yet)
+        slots.append('__dict__')
+        if keys:
+            body.insert(0, f'    {", ".join(f"_v{index}" for index in range(len(keys)))}, = d.values()')
+        shape = type(cls.__name__, (cls,), {
+            '__slots__': tuple(slots), '__shape__': tuple(zip(keys, names)), '__module__': cls.__module__,
+        })
+        namespace = {'_new': object.__new__, '_shape': shape, '_ATOMIC': cls._ATOMIC, '_convert': cls._convert}
+        source = '\n'.join(['def build(d):', '    self = _new(_shape)'] + body + ['    return self'])
+        exec(compile(source, f'<Dict_to_Obj of {", ".join(names)}>', 'exec'), namespace)
+        return namespace['build']
 
-            return wrapper
+    @classmethod
+    def _convert(cls, value):
+        if isinstance(value, dict):
+            return cls.__new__(cls, value)
+        if isinstance(value, (list, tuple)):
+            atomic = cls._ATOMIC
+            if atomic.issuperset(map(type, value)):
+                return list(value)
+            return [x if type(x) in atomic else cls._convert(x) for x in value]
+        cls._ATOMIC.add(type(value))
+        return value
 
-        return decorator
+    @classmethod
+    def from_records(cls, records, columnar=False, chunk_size=10000, infer_schema=100, column_type=list):
+        '''
+        Converts an iterable of dictionaries or a JSON-lines file (one JSON object per line, optionally gzip
+        compressed) lazily. Records are read and converted one at a time, so the memory needed does not depend on the
+        number of records.
+
+        The schema (the keys of all records in the order of their first occurrence) is inferred from the first
+        ``infer_schema`` records. Records whose keys are part of it are converted into the same generated type, keys
+        they do not have are set to None. Records with further keys are converted as by ``Dict_to_Obj``.
+
+        With ``columnar=True``, chunks of ``chunk_size`` records are yielded as a dictionary of columns instead, i.e. a
+        key maps to the record's values of it (None for records without the key). ``column_type`` converts the columns,
+        e.g. ``numpy.asarray``. Values are not converted in the columnar representation.
+
+        Example::
+
+        > for record in Dict_to_Obj.from_records('dump.jsonl.gz'):
+        >     record.id
+        > for chunk in Dict_to_Obj.from_records('dump.jsonl', columnar=True, column_type=numpy.asarray):
+        >     chunk['score'].mean()
+
+        :param records: iterable of dictionaries or path of a JSON-lines file
+        :param columnar: if set to True, chunks of columns are yielded instead of objects
+        :type columnar: bool
+        :param chunk_size: number of records per columnar chunk. None yields all records in one chunk.
+        :type chunk_size: int
+        :param infer_schema: number of records the schema is inferred from
+        :type infer_schema: int
+        :param column_type: function converting a column (list of values) in the columnar representation
+        :return: generator of converted objects or of dictionaries of columns
+        '''
+        if isinstance(records, (str, PathLike)):
+            records = cls._read_json_lines(records)
+        if columnar:
+            return cls._columns(records, chunk_size, column_type)
+        return cls._objects(records, infer_schema)
 
     @staticmethod
-    def accepted_arguments(accepted_args:list):
+    def _read_json_lines(path):
+        import json
+        if str(path).endswith('.gz'):
+            import gzip
+            file = gzip.open(path, 'rt', encoding='utf-8')
+        else:
+            file = open(path, encoding='utf-8')
+        with file:
+            for number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f'Line {number} of "{path}" is no valid JSON: {e}') from e
+
+    @classmethod
+    def _objects(cls, records, infer_schema):
+        records = iter(records)
+        sample = list(islice(records, infer_schema))
+        schema = {}
+        for record in sample:
+            schema.update(dict.fromkeys(record))
+        schema = tuple(schema)
+        build, schema_keys = cls._build_function(schema, recurring=True), frozenset(schema)
+        for record in chain(sample, records):
+            keys = tuple(record)
+            if keys == schema:
+                yield build(record)
+            elif schema_keys.issuperset(keys):
+                yield build({key: record.get(key) for key in schema})
+            else:
+                yield cls.__new__(cls, record)
+
+    @staticmethod
+    def _columns(records, chunk_size, column_type):
+        columns, rows = {}, 0
+        for record in records:
+            for key, value in record.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * rows
+                column.append(value)
+            rows += 1
+            if len(record) < len(columns):
+                for column in columns.values():
+                    if len(column) < rows:
+                        column.append(None)
+            if rows == chunk_size:
+                yield {key: column_type(column) for key, column in columns.items()}
+                columns, rows = {key: [] for key in columns}, 0
+        if rows:
+            yield {key: column_type(column) for key, column in columns.items()}
+
+    def to_dict(self) -> dict:
         '''
-        When decorating a function with this decorator, the function's arguments are checked against a list of valid arguments.
-        If an invalid argument is encoutered, the function is not executed.
+        Converts the object back into a dictionary. Nested objects are converted as well.
+        '''
+        return {key: Dict_to_Obj._to_value(getattr(self, name)) for key, name in self.__shape__}
+
+    @staticmethod
+    def _to_value(value):
+        if isinstance(value, Dict_to_Obj):
+            return Dict_to_Obj.to_dict(value)
+        if isinstance(value, list):
+            return [Dict_to_Obj._to_value(x) for x in value]
+        return value
+
+    def __repr__(self):
+        return f'Dict_to_Obj({Dict_to_Obj.to_dict(self)!r})'
+
+    def __reduce__(self):
+        # the generated classes can not be pickled by reference
+        return Dict_to_Obj, (Dict_to_Obj.to_dict(self),)
+
+
+class _UnshapedObj(Dict_to_Obj):
+    """
+    The object of ``Dict_to_Obj`` for dictionaries whose shape has no generated class. The attributes are stored in
+    its ``__dict__`` and the keys and attribute names in ``__shape__``.
+    """
+    __slots__ = ('__shape__', '__dict__')
+
+
+def _build_unshaped(d):
+    self = object.__new__(_UnshapedObj)
+    attributes, shape, atomic = self.__dict__, [], Dict_to_Obj._ATOMIC
+    for key, value in d.items():
+        name = str(key)
+        attributes[name] = value if type(value) in atomic else Dict_to_Obj._convert(value)
+        shape.append((key, name))
+    if len(attributes) < len(shape):
+        names = {}
+        for key, name in shape:
+            if name in names:
+                raise ValueError(f'The keys {names[name]!r} and {key!r} can not be converted as both result in the '
+                                 f'attribute "{name}"')
+            names[name] = key
+    self.__shape__ = tuple(shape)
+    return self
+
+
+class Dict_View(MutableMapping):
+    '''
+    This class provides the attribute notation of ``Dict_to_Obj`` as a view of a dictionary instead of a copy.
+    Values are read from the dictionary when they are accessed. Nested dictionaries and lists are wrapped into views
+    on access as well, so only the parts of a large payload which are read cost anything. Setting or deleting an
+    attribute or item changes the underlying dictionary. The view is a ``MutableMapping``, so it can be passed where a
+    dictionary is expected (e.g. ``dict(view)``) and all its methods such as ``update`` or ``pop`` write through.
+
+    The attributes of the class (its methods such as ``keys`` or ``get`` and the special methods) take precedence over
+    keys of the same name, so the view keeps working as a mapping whatever keys it holds. Such keys and keys which are
+    no valid attribute names can be accessed as items, e.g. ``view['keys']`` or ``view['first-name']``. A view is
+    created for every access of a nested value, hence ``view.a is view.a`` is False while ``view.a == view.a`` is True.
+
+    Example::
+
+    > config = json.load(file)
+    > view = Dict_View(config)
+    > view.database.hosts[0].port
+    > view.database.timeout = 30
+    > # config['database']['timeout'] is now 30
+    '''
+    __slots__ = ('_data',)
+
+    def __init__(self, d):
+        _set_view_data(self, d)
+
+    def __getattribute__(self, name):
+        if name in _DICT_VIEW_ATTRIBUTES:
+            return object.__getattribute__(self, name)
+        try:
+            value = _get_dict_data(self)[name]
+        except KeyError:
+            return object.__getattribute__(self, name)
+        return _view(value) if isinstance(value, _VIEWED) else value
+
+    def __getattr__(self, name):
+        raise AttributeError(f"'Dict_View' object has no attribute or key '{name}'")
+
+    def __setattr__(self, name, value):
+        _get_dict_data(self)[name] = _unview(value)
+
+    def __delattr__(self, name):
+        try:
+            del _get_dict_data(self)[name]
+        except KeyError:
+            raise AttributeError(f"'Dict_View' object has no key '{name}'") from None
+
+    def __getitem__(self, key):
+        value = _get_dict_data(self)[key]
+        return _view(value) if isinstance(value, _VIEWED) else value
+
+    def __setitem__(self, key, value):
+        _get_dict_data(self)[key] = _unview(value)
+
+    def __delitem__(self, key):
+        del _get_dict_data(self)[key]
+
+    def __contains__(self, key):
+        return key in _get_dict_data(self)
+
+    def __iter__(self):
+        return iter(_get_dict_data(self))
+
+    def __len__(self):
+        return len(_get_dict_data(self))
+
+    def clear(self):
+        _get_dict_data(self).clear()
+
+    def __eq__(self, other):
+        return _get_dict_data(self) == _unview(other)
+
+    __hash__ = None
+
+    def __dir__(self):
+        return [key for key in _get_dict_data(self) if isinstance(key, str) and key.isidentifier()]
+
+    def __repr__(self):
+        return f'Dict_View({_get_dict_data(self)!r})'
+
+    def __reduce__(self):
+        return Dict_View, (_get_dict_data(self),)
+
+
+class List_View(MutableSequence):
+    '''
+    This class is the view of a list within a ``Dict_View``. Items which are dictionaries or lists are wrapped into
+    views on access and changes, including the ones by the methods of ``MutableSequence`` such as ``extend``,
+    ``insert`` or ``pop``, go through to the underlying list.
+    '''
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        _set_list_data(self, data)
+
+    def __getitem__(self, index):
+        value = _get_list_data(self)[index]
+        if isinstance(index, slice):
+            return List_View(value)
+        return _view(value) if isinstance(value, _VIEWED) else value
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_unview(item) for item in value]
+        else:
+            value = _unview(value)
+        _get_list_data(self)[index] = value
 
-        Example::
+    def __delitem__(self, index):
+        del _get_list_data(self)[index]
 
-        > @Decorators.accepted_arguments([0,1])
-        > 1 def foo(x):
-        >    ...
-        > 7 foo(10)
-        > # console prints: Encountered a non-valid argument.
-        > # console prints: Valid arguments are: [0,1]
+    def insert(self, index, value):
+        _get_list_data(self).insert(index, _unview(value))
 
-        :param accepted_args: list of accepted arguments by the function
-        :type accepted_args: list
-        :return: a decorated function which checks the aguments
-        '''
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args):
-                try:
-                    assert all([a in accepted_args for a in args])
-                except AssertionError:
-                    raise SyntaxError(f'Encountered a non-valid argument.\nValid arguments are: {accepted_args}')
-                result = func(*args)
-                return result
-            return wrapper
-        return decorator
+    def __iter__(self):
+        return (_view(value) if isinstance(value, _VIEWED) else value for value in _get_list_data(self))
 
-    @staticmethod
-    def accepted_arguments_within_class_methods(accepted_args):
-        '''
-        When decorating a function with this decorator, the function's arguments are checked against a list of valid arguments.
-        If an invalid argument is encountered, the function is not executed. This decorator is basically the same as "accepted_arguments"
-        decorator except that it is aimed for functions within classes (i.e. containing a "self" parameter). In these setup, the class instance
-        itself is passed as the first argument. Therefore, this Decorator only checks the second till last argument for correctness.
+    def __len__(self):
+        return len(_get_list_data(self))
 
-        Example::
+    def __eq__(self, other):
+        return _get_list_data(self) == _unview(other)
 
-        > 1 class Foo:
-        > 2   ...
-        > ...
-        > 10   @Decorators.accepted_arguments_within_class_methods([0,1])
-        > 11   def bar(self):
-        > 12         ...
-        > ...
-        > 18 foo=Foo(1)
-        > 19 foo.bar()
-        > # console prints: Encountered a non-valid argument.
-        > # console prints: Valid arguments are: [0,1]
+    __hash__ = None
 
-        :param accepted_args: list of accepted arguments by the function
-        :type accepted_args: list
-        :return: a decorated function which checks the aguments
-        '''
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args):
-                try:
-                    assert all([a in accepted_args for a in args[1:]])
-                except AssertionError:
-                    raise SyntaxError(f'Encountered a non-valid argument.\nValid arguments are: {accepted_args}')
-                result = func(*args)
-                return result
-            return wrapper
-        return decorator
+    def __contains__(self, value):
+        return _unview(value) in _get_list_data(self)
 
-    @staticmethod
-    def accepted_argument_types(*decorator_args):
-        '''
-        When decorating a function with this decorator, the function's arguments types are checked against a list of valid types.
-        The types are provided in the same order as the corresponding arguments such that they match.
+    def index(self, value, start=0, stop=None):
+        data = _get_list_data(self)
+        return data.index(_unview(value), start, len(data) if stop is None else stop)
 
-        Example::
+    def count(self, value):
+        return _get_list_data(self).count(_unview(value))
 
-        > @Decorators.accepted_argument_types(str,str)
-        > 1 def foo(x,y):
-        >    ...
-        > 7 foo(10,5)
-        > # console prints: Argument Types do not match expected types.
-        > # console prints: Expected str, str but got int, int
+    def append(self, value):
+        _get_list_data(self).append(_unview(value))
 
-        :param decorator_args:
-        :return:
-        '''
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                check_args = dict(zip(decorator_args, args))
-                for argument_types, arguments in check_args.items():
-                    try:
-                        assert isinstance(arguments, argument_types)
-                    except AssertionError:
-                        raise TypeError(f'Argument Types do not match expected types.\nExpected {type(arguments)} but got {argument_types}')
-                result = func(*args, **kwargs)
-                return result
-            return wrapper
-        return decorator
+    def extend(self, values):
+        _get_list_data(self).extend([_unview(value) for value in values])
 
-    @staticmethod
-    def class_object_has_attr(attribute):
-        '''
-        When decorating a class method with this function, it checks if the class instance has a given attribute.
-        It allows chaining to get deep levels of attributes. Note that this decorator can only be used by class methods.
+    def reverse(self):
+        _get_list_data(self).reverse()
 
-        :param attribute:
-        :return:
-        '''
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                try:
-                    assert has_deep_attr(args[0], attribute)
-                    result = func(*args, **kwargs)
-                    return result
-                except AssertionError:
-                    log.error(f"The object '{object}' does not have the required attribute {attribute}.")
-            return wrapper
-        return decorator
+    def clear(self):
+        _get_list_data(self).clear()
 
-    @classmethod
-    def container_non_empty(cls, func):
-        '''
-        When decorating a function with this decorator, the function checks if the object is not empy.
+    def __repr__(self):
+        return f'List_View({_get_list_data(self)!r})'
 
-        Example::
+    def __reduce__(self):
+        return List_View, (_get_list_data(self),)
 
-        > @Decorators.container_non_empty
-        > 1 def foo(x):
-        >    ...
-        > 7 foo('')
-        > # console prints: Container '' is empty
 
-        :param decorator_args:
-        :return:
-        '''
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for argument in args:
-                if cls._is_container(argument):
-                    cls._check_if_empty_container(argument)
-            result = func(*args, **kwargs)
-            return result
+_VIEWED = (dict, list)
+_get_dict_data, _set_view_data = Dict_View._data.__get__, Dict_View._data.__set__
+_DICT_VIEW_ATTRIBUTES = frozenset(dir(Dict_View))
+_get_list_data, _set_list_data = List_View._data.__get__, List_View._data.__set__
 
-        return wrapper
 
-    @staticmethod
-    def _is_container(obj):
-        """
-        Indicates, if an object is a container by checking if is has the __iter__ attribute
+def _view(value):
+    """
+    Wraps a dictionary or list into its view without calling the view's ``__init__``.
+    """
+    if isinstance(value, dict):
+        view = object.__new__(Dict_View)
+        _set_view_data(view, value)
+    else:
+        view = object.__new__(List_View)
+        _set_list_data(view, value)
+    return view
 
-        :param obj: an object whose type is tested
-        :return: True if it is a container object
-        :rtype: bool
-        """
-        return hasattr(type(obj), '__iter__')
 
-    @staticmethod
-    def _check_if_empty_container(obj) -> None:
-        """
-        Checks if the function's argument is a container object.
-        It currently only works for list, dict, str, tuple and set object. Further object types can be added by time.
+def _unview(value):
+    """
+    Returns the dictionary or list underlying a view, other values unchanged.
+    """
+    if isinstance(value, Dict_View):
+        return _get_dict_data(value)
+    if isinstance(value, List_View):
+        return _get_list_data(value)
+    return value
 
-        :param obj: an object, whose size is tested
-        :return: None
-        :raises IndexError if the container is empty
 
-        """
-        obj_type = type(obj)
-        cond = {
-            list: len,
-            dict: len,
-            str: len,
-            tuple: len,
-            set: len,
-            # np.ndarray : np.size,
-            # pd.core.frame.DataFrame : len, #or pd.core.frame.DataFrame.empty
-        }
-        func = cond[obj_type]
-        if not func(obj):
-            raise IndexError(f'Container {obj} is empty')
+class _AttributeLayout:
+    """
+    The attribute layout of a class inheriting from ``ClassAttrHandler``, determined once per class: the names of the
+    slots along the method resolution order and whether instances have a ``__dict__``.
+    """
 
+    MISSING = object()
 
-class Dict_to_Obj:
-    '''
-    This class constructs an object notation out of a dictionary.
-    '''
-    def __init__(self, d):
-        for a, b in d.items():
-            if isinstance(b, (list, tuple)):
-               setattr(self, a, [obj(x) if isinstance(x, dict) else x for x in b])
-            else:
-               setattr(self, a, obj(b) if isinstance(b, dict) else b)
+    def __init__(self, cls):
+        slots = []
+        for base in reversed(cls.__mro__):
+            names = base.__dict__.get('__slots__', ())
+            for name in (names,) if isinstance(names, str) else names:
+                if name.startswith('__') and not name.endswith('__'):
+                    name = f'_{base.__name__.lstrip("_")}{name}'
+                if name not in ('__dict__', '__weakref__') and name not in slots:
+                    slots.append(name)
+        self.slots = tuple(slots)
+        self.has_dict = any('__dict__' in base.__dict__ for base in cls.__mro__ if base is not object)
 
 
 class ClassAttrHandler(object):
@@ -467,6 +3675,9 @@ class ClassAttrHandler(object):
     size, deleting empty attributes and getting a list of strings containg all attributes label or attribute values.
     Usage: costume classes can inherit from this class in order to have additional functionalities with respect to attributes.
 
+    Attributes stored in ``__slots__`` are supported as well as the ones in the instance ``__dict__``. The names of the
+    slots are determined once per class. Queries for attributes of a type check the type of the attributes' values.
+
     Example::
 
 
@@ -481,7 +3692,25 @@ class ClassAttrHandler(object):
     > 9           ....
     > 10  def print_attr_labels(self):
     > 11      print(self.attributes_labels)
+
+    > 1 class Point(ClassAttrHandler):
+    > 2   __slots__ = ('x', 'y', 'label')
+    > 3   x: float
+    > 4   y: float
+    > 5   label: str
+    > ...
+    > 9 point.get_attributes_labels(float)
+    > # returns ['x', 'y'] without reading "label"
     '''
+    __slots__ = ()
+
+    @classmethod
+    def _layout(cls):
+        layout = cls.__dict__.get('_attribute_layout')
+        if layout is None:
+            layout = _AttributeLayout(cls)
+            type.__setattr__(cls, '_attribute_layout', layout)
+        return layout
 
     def __iter__(self):
         '''
@@ -497,10 +3726,32 @@ class ClassAttrHandler(object):
                         ...
 
         In this Example, the class "Myclass" inherits the ClassAttrHandler which therefore allows it to iterate over its attributes.
-        This is achieved via a "for ... in self" loop which yields the attributes and the corresponding value
+        This is achieved via a "for ... in self" loop which yields the attributes and the corresponding value.
+        Slots which have not been set are skipped.
+        '''
+        layout = self._layout()
+        for attr in layout.slots:
+            try:
+                yield attr, getattr(self, attr)
+            except AttributeError:
+                continue
+        if layout.has_dict:
+            yield from self.__dict__.items()
+
+    def _iter_type(self, attr_type):
+        '''
+        Iterates over the attributes whose value is of the given type. Annotations are not taken into account as they
+        are not enforced at runtime.
         '''
-        for attr, value in self.__dict__.items():
-            yield attr, value
+        layout = self._layout()
+        for attr in layout.slots:
+            value = getattr(self, attr, _AttributeLayout.MISSING)
+            if value is not _AttributeLayout.MISSING and isinstance(value, attr_type):
+                yield attr, value
+        if layout.has_dict:
+            for attr, value in self.__dict__.items():
+                if isinstance(value, attr_type):
+                    yield attr, value
 
     def _return_container_size(self):
         '''
@@ -508,11 +3759,137 @@ class ClassAttrHandler(object):
 
         :return: all attributes represent their length value
         '''
-        for i in self:
-            if Decorators._is_container(i[0]):
-                self.__dict__[i[0]] = len(i[1])
+        for label, value in list(self):
+            setattr(self, label, len(value) if hasattr(type(value), '__len__') else 'No Container attribute')
+
+    def memory_report(self, top=None, sample_size=1000) -> dict:
+        '''
+        Returns how much memory the object's attributes take, without changing them. The size of an attribute is the
+        deep size of its value, i.e. including all objects referenced by it. Every object is counted once per
+        attribute, also if it is referenced several times or in a cycle, and objects reachable from several attributes
+        are reported as shared. Classes, modules and functions are not counted.
+        Buffers are counted by ``sys.getsizeof``, which includes the data of bytes, strings and NumPy arrays owning
+        their data; views of arrays and memoryviews are counted via the object owning the data. pandas objects are
+        counted by their ``memory_usage(deep=True)``.
+
+        Containers with more than ``sample_size`` items are sampled: only ``sample_size`` of their items are traversed
+        and the size of the others is extrapolated (reported as ``estimated_bytes`` and included in ``bytes``). A sampled
+        container reachable from several attributes is counted once in ``total_bytes`` and as shared, like any other
+        object.
+
+        Example::
+
+        > model.memory_report(top=2)
+        > # returns {'total_bytes': 80123456,
+        > #          'attributes': [{'attribute': 'embeddings', 'bytes': 80000112, 'shared_bytes': 0, 'estimated_bytes': 0},
+        > #                         {'attribute': 'index', 'bytes': 123344, 'shared_bytes': 0, 'estimated_bytes': 98000}]}
+
+        :param top: optional number of the largest attributes to report
+        :type top: int
+        :param sample_size: maximum number of items traversed per container
+        :type sample_size: int
+        :return: the total size and the attributes' sizes in bytes, the largest first
+        :rtype: dict
+        '''
+        from collections import Counter
+        exclude, descriptors, walked = {id(self)}, {}, []
+        for label, value in self:
+            sizes, estimates = {}, {}
+            ClassAttrHandler._walk_deep_size([value], sizes, exclude, descriptors, sample_size, estimates)
+            walked.append((label, sizes, estimates))
+        references = Counter(key for _, sizes, _ in walked for key in sizes)
+        unique, unique_estimates, report = {}, {}, []
+        for label, sizes, estimates in walked:
+            unique.update(sizes)
+            unique_estimates.update(estimates)
+            estimated = sum(estimates.values())
+            report.append({
+                'attribute': label,
+                'bytes': sum(sizes.values()) + estimated,
+                'shared_bytes': sum(size for key, size in chain(sizes.items(), estimates.items()) if references[key] > 1),
+                'estimated_bytes': estimated,
+            })
+        report.sort(key=lambda attribute: attribute['bytes'], reverse=True)
+        return {
+            'total_bytes': sum(unique.values()) + sum(unique_estimates.values()),
+            'attributes': report[:top] if top is not None else report,
+        }
+
+    @staticmethod
+    def _walk_deep_size(roots, sizes, exclude, descriptors, sample_size, estimates):
+        '''
+        Adds the sizes of all objects reachable from ``roots`` which are not in ``sizes`` yet (keyed by their id) to it.
+        The bytes extrapolated for a sampled container, apart from the ones of sampled containers within it, are added
+        to ``estimates`` under its id. Returns the number of bytes added and the number of bytes extrapolated.
+        '''
+        from collections import deque
+        from types import BuiltinFunctionType, FunctionType, MemberDescriptorType, MethodType, ModuleType
+        skipped = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+        added, estimated, stack = 0, 0, list(roots)
+        while stack:
+            obj = stack.pop()
+            key = id(obj)
+            if key in sizes or key in exclude or isinstance(obj, skipped):
+                continue
+            obj_type = type(obj)
+            module = obj_type.__module__
+            if module.startswith('pandas') and hasattr(obj, 'memory_usage'):
+                usage = obj.memory_usage(deep=True)
+                sizes[key] = size = int(usage.sum() if hasattr(usage, 'sum') else usage)
+                added += size
+                continue
+            sizes[key] = size = getsizeof(obj)
+            added += size
+            if isinstance(obj, (str, bytes, bytearray, int, float, complex, range)):
+                continue
+            if isinstance(obj, memoryview):
+                stack.append(obj.obj)
+                continue
+            pairs = isinstance(obj, dict)
+            if module == 'numpy' and hasattr(obj, 'nbytes'):
+                if getattr(obj, 'base', None) is not None:
+                    stack.append(obj.base)
+                children = obj.ravel() if getattr(obj.dtype, 'hasobject', False) else ()
+            elif pairs:
+                children = obj.items()
+            elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+                children = obj
             else:
-                self.__dict__[i[0]] = 'No Container attribute'
+                children = []
+                try:
+                    children.append(object.__getattribute__(obj, '__dict__'))
+                except AttributeError:
+                    pass
+                slots = descriptors.get(obj_type)
+                if slots is None:
+                    slots = descriptors[obj_type] = [
+                        descriptor for base in obj_type.__mro__ for descriptor in vars(base).values()
+                        if isinstance(descriptor, MemberDescriptorType)
+                    ]
+                for descriptor in slots:
+                    try:
+                        children.append(descriptor.__get__(obj, obj_type))
+                    except AttributeError:
+                        pass
+            length = len(children)
+            if length > sample_size:
+                if isinstance(children, (list, tuple)) or module == 'numpy':
+                    children = children[::length // sample_size][:sample_size]
+                else:
+                    children = list(islice(children, sample_size))
+            if pairs:
+                children = [part for item in children for part in item]
+            if length <= sample_size:
+                stack.extend(children)
+                continue
+            sample_added, sample_estimated = ClassAttrHandler._walk_deep_size(
+                children, sizes, exclude, descriptors, sample_size, estimates
+            )
+            added += sample_added
+            extrapolated = int((sample_added + sample_estimated) * length / sample_size) - sample_added
+            estimates[key] = extrapolated - sample_estimated
+            estimated += extrapolated
+        return added, estimated
 
     def _delete_empty_attributes(self):
         '''
@@ -524,64 +3901,468 @@ class ClassAttrHandler(object):
         for attr in attrs_to_delete:
             delattr(self,attr)
 
-    @property
-    def attributes_labels(self, attr_type=None):
+    def get_attributes_labels(self, attr_type=None):
         '''
         Returns a list of an object's attributes labels. If provided with attr_type, only attributes labels of a certain type are written into the list
 
         :param attr_type: Optional argument to restrict the attribute list to attributes of the given type.
         :return: a list of strings containing all attributes labels
         '''
-        return [attr_label for attr_label, attr_val in self] if not attr_type else [attr_label for attr_label, attr_val
-                                                                                    in self if
-                                                                                    isinstance(attr_val, attr_type)]
-    @property
-    def attributes_values(self, attr_type=None):
+        return [attr_label for attr_label, attr_val in (self._iter_type(attr_type) if attr_type else self)]
+
+    def get_attributes_values(self, attr_type=None):
         '''
         Returns a list of an object's attributes values. If provided with attr_type, only attributes values of a certain type are written into the list
 
         :param attr_type: Optional argument to restrict the attribute list to attributes of the given type.
-        :return: a list of strings containing all attributes values
+        :return: a list of all attributes values
+        '''
+        return [attr_val for attr_label, attr_val in (self._iter_type(attr_type) if attr_type else self)]
+
+    @property
+    def attributes_labels(self):
+        '''
+        Returns a list of all of an object's attributes labels. See ``get_attributes_labels`` to filter them by type.
+        '''
+        return self.get_attributes_labels()
+
+    @property
+    def attributes_values(self):
+        '''
+        Returns a list of all of an object's attributes values. See ``get_attributes_values`` to filter them by type.
+        '''
+        return self.get_attributes_values()
+
+    _accessors = {}
+
+    @staticmethod
+    def compile_path(attrs):
+        '''
+        Returns a function which reads the nested/composed attribute ``attrs`` (e.g. "config.paths.root") of an object.
+        The functions are ``operator.attrgetter`` objects, i.e. the attributes are read in C, and cached per path.
+
+        :param attrs: attribute names separated by dots
+        :type attrs: str
+        :return: function taking an object and returning its attribute
         '''
-        return [attr_val for attr_label, attr_val in self] if not attr_type else [attr_val for attr_label, attr_val in
-                                                                                  self if
-                                                                                  isinstance(attr_val, attr_type)]
+        accessor = ClassAttrHandler._accessors.get(attrs)
+        if accessor is None:
+            accessor = ClassAttrHandler._accessors[attrs] = attrgetter(attrs)
+        return accessor
+
     @staticmethod
     def get_deep_attr(obj, attrs):
         '''
         This function is a helper function which allows attributes checking for nested/composed attributes.
 
-        :param obj:
-        :param attrs:
-        :return:
+        :param obj: object whose attribute is read
+        :param attrs: attribute names separated by dots, e.g. "config.paths.root"
+        :type attrs: str
+        :return: the attribute's value
+        :raises AttributeError: if an attribute along the path does not exist
         '''
-        for attr in attrs.split("."):
-            obj = getattr(obj, attr)
-        return obj
+        accessor = ClassAttrHandler._accessors.get(attrs)
+        if accessor is None:
+            accessor = ClassAttrHandler.compile_path(attrs)
+        return accessor(obj)
 
     @staticmethod
     def has_deep_attr(obj, attrs):
         '''
         This function is a helper function which allows attributes checking for nested/composed attributes.
 
-        :param obj:
-        :param attrs:
-        :return:
+        :param obj: object whose attribute is checked
+        :param attrs: attribute names separated by dots, e.g. "config.paths.root"
+        :type attrs: str
+        :return: True if all attributes along the path exist
+        :rtype: bool
         '''
         try:
-            get_deep_attr(obj, attrs)
+            ClassAttrHandler.get_deep_attr(obj, attrs)
             return True
         except AttributeError:
             return False
 
+    @staticmethod
+    def extract_deep_attrs(objects, paths, default=None, defaults=None, column_type=list):
+        '''
+        Reads several nested/composed attributes of a sequence of objects in one pass and returns them as columns.
+        All paths of an object are read by a single ``attrgetter`` call. Only objects which miss an attribute along one
+        of the paths are read path by path, the missing attributes are replaced by their default.
+
+        Example::
+
+        > ClassAttrHandler.extract_deep_attrs(orders, ['id', 'customer.country', 'payment.amount'],
+        >                                     defaults={'payment.amount': 0.0}, column_type=numpy.asarray)
+        > # returns {'id': array([...]), 'customer.country': array([...]), 'payment.amount': array([...])}
+
+        :param objects: iterable of objects
+        :param paths: attribute paths, attribute names separated by dots
+        :param default: value of missing attributes
+        :param defaults: optional mapping of paths to the value of their missing attributes
+        :type defaults: dict
+        :param column_type: function converting a column (list of values), e.g. ``numpy.asarray``
+        :return: dictionary mapping the paths to their columns
+        :rtype: dict
+        '''
+        paths = list(paths)
+        if not paths:
+            return {}
+        # attrgetter returns the value itself instead of a tuple for a single path
+        getter, single = attrgetter(*paths), len(paths) == 1
+        accessors = [ClassAttrHandler.compile_path(path) for path in paths]
+        path_defaults = [(defaults or {}).get(path, default) for path in paths]
+        rows = []
+        append = rows.append
+        for obj in objects:
+            try:
+                append(getter(obj))
+            except AttributeError:
+                row = []
+                for accessor, value in zip(accessors, path_defaults):
+                    try:
+                        value = accessor(obj)
+                    except AttributeError:
+                        pass
+                    row.append(value)
+                append(row[0] if single else row)
+        columns = [rows] if single else zip(*rows) if rows else [[] for _ in paths]
+        return {path: column_type(list(column)) for path, column in zip(paths, columns)}
+
 
 def get_date_time(with_time=True) -> str:
     """
     Returns the current date in an date_time format
     """
+    from datetime import datetime
     return datetime.now().strftime("%Y-%m-%d_%H-%M") if with_time else datetime.now().strftime("%Y-%m-%d")
 
-# NEW LOGGER
+def _queue_logging_classes():
+    """
+    Defines ``BoundedQueueHandler`` and ``_DrainingQueueListener`` when they are needed first. They subclass the
+    classes of ``logging.handlers``, which imports socket and pickle and is one of the slowest imports of the module.
+    """
+    global BoundedQueueHandler, _DrainingQueueListener
+    if '_DrainingQueueListener' in globals():
+        return BoundedQueueHandler, _DrainingQueueListener
+    from logging.handlers import QueueHandler, QueueListener
+
+    class BoundedQueueHandler(QueueHandler):
+        """
+        This handler puts log records into a bounded queue which is drained by a background ``QueueListener``.
+        Thereby, formatting and writing records to the terminal or disk does not happen on the logging thread.
+        If the queue is full, the overflow policy decides what happens:
+         - "block": the logging thread waits until the listener made room
+         - "drop_oldest": the oldest queued record is dropped in favour of the new one
+         - "drop_newest": the new record is dropped
+
+        Dropped records are counted by the counter ``log_records_dropped_total`` of the module wide ``metrics``
+        registry.
+
+        Only the message is rendered on the logging thread, to take a snapshot of its arguments. Formatting, including
+        the exception information which is passed on as ``exc_info``, happens in the background.
+        """
+
+        OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+        def __init__(self, queue, overflow='block'):
+            if overflow not in self.OVERFLOW_POLICIES:
+                raise ValueError(
+                    f'Unknown overflow policy "{overflow}". Valid policies are: {self.OVERFLOW_POLICIES}'
+                )
+            super().__init__(queue)
+            self.overflow = overflow
+            self.dropped = metrics.counter('log_records_dropped_total', 'Log records dropped by a full logging queue')
+
+        def prepare(self, record):
+            record.msg = record.getMessage()
+            record.args = None
+            return record
+
+        def enqueue(self, record):
+            from queue import Empty, Full
+            if self.overflow == 'block':
+                self.queue.put(record)
+                return
+            while True:
+                try:
+                    self.queue.put_nowait(record)
+                    return
+                except Full:
+                    self.dropped.inc()
+                    if self.overflow == 'drop_newest':
+                        return
+                try:
+                    self.queue.get_nowait()
+                except Empty:
+                    pass
+                else:
+                    self.queue.task_done()
+
+    class _DrainingQueueListener(QueueListener):
+        """
+        A ``QueueListener`` whose stop waits for room in a full queue instead of failing, so that all queued records
+        are written before the interpreter exits.
+        """
+
+        def enqueue_sentinel(self):
+            self.queue.put(self._sentinel)
+
+    return BoundedQueueHandler, _DrainingQueueListener
+
+
+def __getattr__(name):
+    # the queue logging classes are defined on first access, see _queue_logging_classes
+    if name in ('BoundedQueueHandler', '_DrainingQueueListener'):
+        _queue_logging_classes()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+class BufferedRotatingFileHandler(logging.Handler):
+    """
+    This handler writes log records to a file in large blocks instead of one write per record. Records are buffered
+    until ``buffer_size`` bytes are collected, ``flush_interval`` seconds passed since the last write or a record
+    of at least ``flush_level`` arrives. ``flush`` and ``close`` (called by logging at exit) write the buffer as well.
+
+    The file is rotated once it exceeds ``max_bytes`` and/or every ``rotate_interval`` seconds. A rotated segment is
+    renamed with a timestamp suffix and compressed (gzip or, if the ``zstandard`` package is installed, zstd) in a
+    background thread. Only the ``backup_count`` newest segments are kept.
+
+    Example::
+
+    > 1 handler = BufferedRotatingFileHandler('logs/app.log', max_bytes=100 * 2**20, compression='gzip', backup_count=20)
+    > # writes logs/app.log, rotates it into e.g. logs/app.log.20200409-155300.gz
+    """
+
+    COMPRESSIONS = (None, 'gzip', 'zstd')
+
+    def __init__(self, filename, buffer_size=2**18, flush_interval=1.0, max_bytes=None, rotate_interval=None,
+                 compression='gzip', backup_count=10, flush_level=logging.ERROR, encoding='utf-8'):
+        """
+        :param filename: path of the log file
+        :param buffer_size: number of bytes collected before they are written
+        :type buffer_size: int
+        :param flush_interval: maximum seconds a record stays in the buffer while records keep arriving
+        :type flush_interval: float
+        :param max_bytes: size after which the file is rotated. None disables size based rotation.
+        :type max_bytes: int
+        :param rotate_interval: seconds after which the file is rotated. None disables time based rotation.
+        :type rotate_interval: float
+        :param compression: compression of rotated segments: None, "gzip" or "zstd"
+        :type compression: str
+        :param backup_count: number of rotated segments which are kept. None keeps all of them.
+        :type backup_count: int
+        :param flush_level: records of this level or above are written immediately
+        :type flush_level: int
+        """
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f'Unknown compression "{compression}". Valid compressions are: {self.COMPRESSIONS}')
+        if compression == 'zstd':
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ValueError('The "zstd" compression requires the zstandard package') from None
+        super().__init__()
+        from pathlib import Path
+        self.filename = Path(filename)
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.compression = compression
+        self.backup_count = backup_count
+        self.flush_level = flush_level
+        self.encoding = encoding
+        self._buffer = []
+        self._buffered = 0
+        self._compressors = []
+        self._compress_lock = Lock()
+        self._open()
+
+    def _open(self):
+        self._stream = open(self.filename, 'ab', buffering=0)
+        self._size = self._stream.tell()
+        now = time.monotonic()
+        self._last_flush = now
+        self._rotate_at = now + self.rotate_interval if self.rotate_interval else None
+
+    def emit(self, record):
+        try:
+            data = (self.format(record) + '\n').encode(self.encoding)
+            with self.lock:
+                self._buffer.append(data)
+                self._buffered += len(data)
+                if self._buffered >= self.buffer_size or record.levelno >= self.flush_level or \
+                        time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._write()
+        except Exception:
+            self.handleError(record)
+
+    def _write(self):
+        """
+        Writes the buffer with a single call and rotates the file if needed. Has to be called holding the lock.
+        """
+        if self._buffer:
+            data = b''.join(self._buffer)
+            self._buffer, self._buffered = [], 0
+            self._stream.write(data)
+            self._size += len(data)
+        self._last_flush = time.monotonic()
+        if (self.max_bytes is not None and self._size >= self.max_bytes) or \
+                (self._rotate_at is not None and self._last_flush >= self._rotate_at):
+            self._rotate()
+
+    def _rotate(self):
+        self._stream.close()
+        segment = self.filename.with_name(f'{self.filename.name}.{time.strftime("%Y%m%d-%H%M%S")}')
+        counter = 1
+        while segment.exists() or segment.with_name(segment.name + '.gz').exists() or \
+                segment.with_name(segment.name + '.zst').exists():
+            segment = segment.with_name(f'{self.filename.name}.{time.strftime("%Y%m%d-%H%M%S")}-{counter}')
+            counter += 1
+        self.filename.rename(segment)
+        self._open()
+        self._compressors = [thread for thread in self._compressors if thread.is_alive()]
+        thread = Thread(target=self._compress_and_prune, args=(segment,), name='log-compressor', daemon=True)
+        self._compressors.append(thread)
+        thread.start()
+
+    def _compress_and_prune(self, segment):
+        """
+        Compresses a rotated segment and deletes the oldest segments beyond ``backup_count``.
+        """
+        from shutil import copyfileobj
+        suffix = {'gzip': '.gz', 'zstd': '.zst'}.get(self.compression, '')
+        with self._compress_lock:
+            if self.compression == 'gzip':
+                import gzip
+                with open(segment, 'rb') as source, gzip.open(f'{segment}.gz', 'wb') as target:
+                    copyfileobj(source, target, 2**20)
+                segment.unlink()
+            elif self.compression == 'zstd':
+                import zstandard
+                with open(segment, 'rb') as source, open(f'{segment}.zst', 'wb') as target:
+                    zstandard.ZstdCompressor().copy_stream(source, target)
+                segment.unlink()
+            if self.backup_count is not None:
+                segments = sorted(
+                    self.filename.parent.glob(f'{self.filename.name}.*{suffix}'),
+                    key=lambda path: (path.stat().st_mtime, path.name)
+                )
+                for old in segments[:max(len(segments) - self.backup_count, 0)]:
+                    old.unlink(missing_ok=True)
+
+    def flush(self):
+        with self.lock:
+            if not self._stream.closed:
+                self._write()
+
+    def close(self):
+        with self.lock:
+            if not self._stream.closed:
+                self._write()
+                self._stream.close()
+        for thread in self._compressors:
+            thread.join()
+        super().close()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    This formatter renders each record as one JSON object per line, so log pipelines can ingest it without parsing
+    free text. Besides the time stamp, level, module, function, line and message, the structured data passed by the
+    decorators via ``extra`` (e.g. function, duration_ns, attempt, calls) is emitted as typed fields.
+
+    Serialization is cheap per record: the key layout is encoded once when the formatter is created, level names are
+    encoded once per level and strings are escaped by the C implementation of the ``json`` module. Only the values of
+    extra fields which are no strings, integers or floats go through ``json.dumps``. The output is always valid JSON:
+    NaN and infinite floats are written as the strings "nan", "inf" and "-inf".
+
+    Records of the decorators carry the decorated function as ``function``. For them, ``funcName`` names the decorated
+    function as well instead of the decorator's helper which emitted the record.
+
+    Example output::
+
+    > {"ts":1586440380.123,"level":"INFO","module":"utilities","funcName":"foo","lineno":1093,"msg":"...","function":"foo","duration_ns":153000}
+    """
+
+    FIELDS = ('function', 'duration_ns', 'attempt', 'delay_s', 'calls', 'latency_ns')
+
+    def __init__(self, fields=FIELDS, include_extras=False):
+        """
+        :param fields: names of ``extra`` attributes which are emitted if a record carries them
+        :type fields: tuple
+        :param include_extras: if set to True, all other non standard record attributes are emitted as well
+        :type include_extras: bool
+        """
+        super().__init__()
+        from json import dumps
+        from json.encoder import encode_basestring
+        self._dumps = partial(dumps, default=str, separators=(',', ':'), allow_nan=False)
+        self._encode = encode_basestring
+        self._fields = tuple((name, f',{encode_basestring(name)}:') for name in fields)
+        self._levels = {}
+        self.include_extras = include_extras
+        self._reserved = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'} | \
+            set(fields)
+
+    def _value(self, value):
+        if value is None or value is True or value is False:
+            return 'null' if value is None else ('true' if value else 'false')
+        if type(value) is str:
+            return self._encode(value)
+        if type(value) is int:
+            return str(value)
+        if type(value) is float:
+            return repr(value) if value - value == 0 else f'"{value!r}"'
+        try:
+            return self._dumps(value)
+        except ValueError:
+            # NaN or infinite floats within the value
+            return self._dumps(self._finite(value))
+
+    @classmethod
+    def _finite(cls, value):
+        """
+        Returns the value with NaN and infinite floats, also within lists, tuples and dictionaries, replaced by strings.
+        """
+        if isinstance(value, float):
+            return value if value - value == 0 else repr(value)
+        if isinstance(value, dict):
+            return {key: cls._finite(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._finite(item) for item in value]
+        return value
+
+    def format(self, record):
+        level = self._levels.get(record.levelno)
+        if level is None:
+            level = self._levels[record.levelno] = f',"level":{self._encode(record.levelname)}'
+        parts = [
+            '{"ts":', repr(record.created), level,
+            ',"module":', self._encode(record.module),
+            ',"funcName":', self._encode(str(getattr(record, 'function', record.funcName))),
+            ',"lineno":', str(record.lineno),
+            ',"msg":', self._encode(record.getMessage()),
+        ]
+        attributes = record.__dict__
+        for name, key in self._fields:
+            if name in attributes:
+                parts.append(key)
+                parts.append(self._value(attributes[name]))
+        if self.include_extras:
+            for name, value in attributes.items():
+                if name not in self._reserved:
+                    parts.append(f',{self._encode(name)}:')
+                    parts.append(self._value(value))
+        if record.exc_info:
+            parts.append(',"exc_info":')
+            parts.append(self._encode(self.formatException(record.exc_info)))
+        parts.append('}')
+        return ''.join(parts)
+
 
 class Logger:
     """
@@ -594,11 +4375,17 @@ class Logger:
     Example::
 
     > 1 from Utilities import Logger
-    > 2 log = Logger.log()
+    > 2 log = Logger.log
     > 3 log.info('Control is here')
     > # log prints "Control is here"
+
+    The logger is only built when it is used first, so importing the module does not touch any handlers. Calling
+    ``initialize_log`` before replaces the default settings.
     """
 
+    _listener = None
+    _logger = None
+
     def add_coloring_to_emit_windows(fn):
         def _out_handle(self):
             import ctypes
@@ -700,33 +4487,133 @@ class Logger:
             logging.StreamHandler.emit = cls.add_coloring_to_emit_ansi(logging.StreamHandler.emit)
 
     @classmethod
-    def initialize_log(cls,write_to_file=False, coloured_output = False):
+    def initialize_log(cls,write_to_file=False, coloured_output = False, async_mode=False, queue_size=10000,
+                       overflow='block', buffer_size=None, max_bytes=None, rotate_interval=None, compression='gzip',
+                       backup_count=10, structured=False):
         """
         Initializes a logging instance that writes to stout. It can optionally also write to a logging file
 
+        Passing ``buffer_size``, ``max_bytes`` or ``rotate_interval`` writes the log file through a
+        ``BufferedRotatingFileHandler`` which writes in large blocks and rotates and compresses the file.
+
+        In the async mode, the caller only puts records into a bounded in-memory queue. A background thread formats
+        them and writes them to the terminal and the file (see ``BoundedQueueHandler``). ``Logger.flush`` waits until
+        the queued records are written. At exit, or when ``Logger.shutdown`` is called, the background thread is stopped
+        and the records are written synchronously again.
+
         :param write_to_file: indicates, if a subdirectory with "logs" is  created in which a logging file is written into
         :type write_to_file: bool
+        :param async_mode: if set to True, records are written by a background thread
+        :type async_mode: bool
+        :param queue_size: maximum number of queued records in the async mode
+        :type queue_size: int
+        :param overflow: what happens if the queue is full: "block", "drop_oldest" or "drop_newest"
+        :type overflow: str
+        :param buffer_size: if given, the log file is written in blocks of this many bytes
+        :type buffer_size: int
+        :param max_bytes: if given, the log file is rotated once it exceeds this size
+        :type max_bytes: int
+        :param rotate_interval: if given, the log file is rotated every this many seconds
+        :type rotate_interval: float
+        :param compression: compression of rotated log files: None, "gzip" or "zstd"
+        :type compression: str
+        :param backup_count: number of rotated log files which are kept
+        :type backup_count: int
+        :param structured: if set to True, records are written as JSON objects (see ``JsonFormatter``)
+        :type structured: bool
         :return:
         """
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.INFO)
-        formatter = logging.Formatter("%(asctime)s,%(msecs)d - file: %(module)s  - func: %(funcName)s - line: %(lineno)d - %(levelname)s - msg: %(message)s",datefmt="%H:%M:%S")
-        console_output = logging.StreamHandler(sys.stdout)
+        if structured:
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter("%(asctime)s,%(msecs)d - file: %(module)s  - func: %(funcName)s - line: %(lineno)d - %(levelname)s - msg: %(message)s",datefmt="%H:%M:%S")
+        console_output = logging.StreamHandler(stdout)
         console_output.setFormatter(formatter)
+        cls.shutdown()
         if logger.hasHandlers():
             logger.handlers.clear()
         logger.addHandler(console_output)
         if write_to_file:
+            from pathlib import Path
             Path('logs').mkdir(parents=True, exist_ok=True)
             log_file_name = f'log_{__name__}_{get_date_time()}.log'
-            file_output = logging.FileHandler(Path('logs').joinpath(log_file_name))
+            if buffer_size is None and max_bytes is None and rotate_interval is None:
+                file_output = logging.FileHandler(Path('logs').joinpath(log_file_name))
+            else:
+                file_output = BufferedRotatingFileHandler(
+                    Path('logs').joinpath(log_file_name), buffer_size=buffer_size or 2**18, max_bytes=max_bytes,
+                    rotate_interval=rotate_interval, compression=compression, backup_count=backup_count
+                )
             file_output.setFormatter(formatter)
             print(file_output)
             logger.addHandler(file_output)
         if coloured_output:
             cls.colored_output()
+        if async_mode:
+            from queue import Queue
+            import atexit
+            queue = Queue(maxsize=queue_size)
+            handler_class, listener_class = _queue_logging_classes()
+            queue_handler = handler_class(queue, overflow=overflow)
+            cls._listener = listener_class(queue, *logger.handlers, respect_handler_level=True)
+            logger.handlers = [queue_handler]
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+        cls._logger = logger
         return logger
 
+    @classmethod
+    def flush(cls):
+        """
+        Waits until all records which are queued in the async mode are written and flushes the handlers. The
+        background thread keeps running, so records logged afterwards are written as before.
+        """
+        listener = cls._listener
+        if listener is not None:
+            listener.queue.join()
+            for handler in listener.handlers:
+                handler.flush()
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Writes all records which are queued in the async mode, stops the background thread and lets the logger write
+        records synchronously to its handlers again.
+        """
+        listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+            if cls._logger is not None:
+                cls._logger.handlers = list(listener.handlers)
+
+
+
+class _LazyLogger:
+    """
+    Stands in for the module logger until it is used first. The first attribute access initializes the logger with
+    the default settings (unless ``Logger.initialize_log`` was called before) and rebinds ``log`` and ``Logger.log``
+    to it, so that the module's own calls do not go through the proxy afterwards.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _resolve():
+        global log
+        log = Logger.log = Logger._logger or Logger.initialize_log()
+        return log
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self):
+        return repr(self._resolve())
+
 
-log = Logger.initialize_log()
+log = Logger.log = _LazyLogger()
 
@@ -0,0 +1,239 @@
+"""
+Measures the per call overhead of the decorators against the undecorated function and the time of importing the module.
+
+Every decorator is applied to a trivial and a more realistic function. Both are called in a single thread and from
+several threads at once. The overhead is the best time per call of the decorated function minus the one of the
+undecorated function.
+
+Usage::
+
+    python benchmark.py --output before.json
+    # change the wrappers
+    python benchmark.py --baseline before.json --threshold 20
+
+With ``--baseline``, the script fails if the overhead of a decorator grew by more than ``--threshold`` percent (and
+by more than ``--min-ns`` nanoseconds, so that timer noise on cheap wrappers does not count as a regression).
+"""
+import sys
+sys.path.append("../src")
+sys.path.append("./src")
+import atexit
+import json
+import logging
+import os
+import platform
+import shutil
+from argparse import ArgumentParser
+from tempfile import mkdtemp
+from threading import Barrier, Thread
+from time import perf_counter
+from timeit import repeat
+from utilities import Decorators, LogSampler, log
+
+
+# the benchmark measures the wrappers, not the log handlers
+log.setLevel(logging.WARNING)
+
+
+def trivial(x: int, y: int = 1) -> int:
+    return x + y
+
+
+def realistic(values: list, scale: float = 1.0) -> float:
+    total = 0.0
+    for value in values:
+        total += value * scale
+    return total / len(values)
+
+
+WORKLOADS = {
+    'trivial': dict(func=trivial, args=(1,), kwargs={'y': 2}, types=(int, int), attribute='real', number=20000),
+    'realistic': dict(func=realistic, args=([float(i) for i in range(100)],), kwargs={'scale': 2.0},
+                      types=(list, float), attribute='copy', number=5000),
+}
+
+CACHE_DIR = mkdtemp(prefix='utilities_benchmark_')
+atexit.register(shutil.rmtree, CACHE_DIR, ignore_errors=True)
+
+# each entry returns the decorator for a workload
+DECORATORS = {
+    'run_time': lambda w: Decorators.run_time,
+    'run_time_histogram': lambda w: Decorators.run_time(histogram=True),
+    'profile': lambda w: Decorators.profile,
+    'memoize': lambda w: Decorators.memoize,
+    'disk_cache': lambda w: Decorators.disk_cache(path=os.path.join(CACHE_DIR, f"{w['func'].__name__}.sqlite")),
+    'show_args': lambda w: Decorators.show_args,
+    'counter': lambda w: Decorators.counter,
+    'counter_silent': lambda w: Decorators.counter(log_calls=False),
+    'counter_sampled': lambda w: Decorators.counter(sampling=LogSampler(limit=10, window=1)),
+    'retry': lambda w: Decorators.retry(3, 1),
+    'retry_with_exponential_stalling': lambda w: Decorators.retry_with_exponential_stalling(3),
+    'accepted_arguments': lambda w: Decorators.accepted_arguments([*w['args'], *w['kwargs'].values()]),
+    'accepted_arguments_within_class_methods':
+        lambda w: Decorators.accepted_arguments_within_class_methods([*w['args'], *w['kwargs'].values()]),
+    'accepted_argument_types': lambda w: Decorators.accepted_argument_types(*w['types']),
+    'validate': lambda w: Decorators.validate,
+    'class_object_has_attr': lambda w: Decorators.class_object_has_attr(w['attribute']),
+    'container_non_empty': lambda w: Decorators.container_non_empty,
+    'stacked': lambda w: lambda func: Decorators.run_time(
+        Decorators.counter(Decorators.show_args(Decorators.accepted_argument_types(*w['types'])(
+            Decorators.retry(3, 1)(func))))),
+    'composed': lambda w: Decorators.compose(
+        Decorators.run_time, Decorators.counter, Decorators.show_args, Decorators.accepted_argument_types(*w['types']),
+        Decorators.retry(3, 1)),
+}
+
+# importing the module must stay cheap: the logger is built on first use and rarely used modules are imported locally.
+# Most of the import time is spent importing logging which the module needs anyway. So the time the module adds on top
+# is measured relative to the import of logging in the same interpreter, which makes the budget independent of the
+# speed of the machine. The module adds about a quarter of it, while importing e.g. inspect at the top would more than
+# double it.
+IMPORT_BUDGET = 0.5
+IMPORT_SNIPPET = (
+    "from time import perf_counter\n"
+    "start = perf_counter()\n"
+    "import logging\n"
+    "reference = perf_counter() - start\n"
+    "start = perf_counter()\n"
+    "import utilities\n"
+    "duration = perf_counter() - start\n"
+    "assert not logging.getLogger('utilities').handlers, 'the logger was initialized at import'\n"
+    "print(duration * 1e3, reference * 1e3)\n"
+)
+
+
+def per_call_ns(call, number, runs):
+    """
+    Returns the best time of a call in nanoseconds out of several runs.
+    """
+    return min(repeat(call, number=number, repeat=runs)) / number * 1e9
+
+
+def threaded_per_call_ns(call, number, runs, threads):
+    """
+    Returns the best time of a call in nanoseconds out of several runs in which all threads call concurrently.
+    It is the wall time of a run divided by the calls of all threads, i.e. it includes any contention of the threads.
+    """
+    def work():
+        barrier.wait()
+        for _ in range(number):
+            call()
+
+    best = float('inf')
+    for _ in range(runs):
+        barrier = Barrier(threads + 1)
+        workers = [Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = perf_counter()
+        for worker in workers:
+            worker.join()
+        best = min(best, perf_counter() - start)
+    return best / (number * threads) * 1e9
+
+
+def import_ms(runs=5):
+    """
+    Returns the best times of importing the module (after logging) and of importing logging in a fresh interpreter in
+    milliseconds out of several runs. The first import is not counted as it compiles the module to bytecode.
+    """
+    import subprocess
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+    env = dict(os.environ, PYTHONPATH=src)
+    # otherwise every run would compile the module
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    times = [
+        [float(time) for time in subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], env=env, check=True,
+                                                capture_output=True, text=True).stdout.split()]
+        for _ in range(runs + 1)
+    ]
+    return min(duration for duration, _ in times[1:]), min(reference for _, reference in times[1:])
+
+
+def run(names, runs, threads, scale):
+    """
+    Returns the overhead in nanoseconds per call, keyed by "<workload>/<mode>/<decorator>", and the undecorated
+    time per call, keyed by "<workload>/<mode>".
+    """
+    overheads, baselines = {}, {}
+    for workload, w in WORKLOADS.items():
+        args, kwargs = w['args'], w['kwargs']
+        number = max(1, int(w['number'] * scale))
+        measures = {
+            'sync': lambda call: per_call_ns(call, number, runs),
+            'threaded': lambda call: threaded_per_call_ns(call, max(1, number // threads), runs, threads),
+        }
+        for mode, measure in measures.items():
+            func = w['func']
+            baseline = baselines[f'{workload}/{mode}'] = measure(lambda: func(*args, **kwargs))
+            for name in names:
+                decorated = DECORATORS[name](w)(func)
+                overheads[f'{workload}/{mode}/{name}'] = measure(lambda: decorated(*args, **kwargs)) - baseline
+    return overheads, baselines
+
+
+def regressions(overheads, previous, threshold, min_ns):
+    """
+    Returns the cases whose overhead grew by more than ``threshold`` percent and ``min_ns`` nanoseconds.
+    """
+    return {
+        case: (previous[case], overhead) for case, overhead in overheads.items()
+        if case in previous and overhead - previous[case] > max(min_ns, abs(previous[case]) * threshold / 100)
+    }
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('decorators', nargs='*', help=f"decorators to measure (default: all): {', '.join(DECORATORS)}")
+    parser.add_argument('--output', help='JSON file the results are written to')
+    parser.add_argument('--baseline', help='JSON file of an earlier run the results are compared with')
+    parser.add_argument('--threshold', type=float, default=20, help='allowed increase of an overhead in percent')
+    parser.add_argument('--min-ns', type=float, default=250, help='increases below this many ns are noise')
+    parser.add_argument('--runs', type=int, default=5, help='runs per case of which the best one counts')
+    parser.add_argument('--threads', type=int, default=4, help='threads of the threaded cases')
+    parser.add_argument('--scale', type=float, default=1, help='factor on the number of calls per run')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help='allowed import time of the module as a multiple of the import time of logging')
+    options = parser.parse_args()
+    unknown = set(options.decorators) - set(DECORATORS)
+    if unknown:
+        parser.error(f"unknown decorators: {', '.join(sorted(unknown))}")
+
+    overheads, baselines = run(options.decorators or list(DECORATORS), options.runs, options.threads, options.scale)
+    print(f"{'case':<62}{'overhead per call':>20}")
+    for case, overhead in overheads.items():
+        workload, mode, _ = case.split('/')
+        print(f"{case:<62}{overhead:>18.0f}ns  (undecorated: {baselines[f'{workload}/{mode}']:.0f}ns)")
+
+    import_time, reference_time = import_ms()
+    print(f"\nImport of utilities: {import_time:.1f}ms on top of {reference_time:.1f}ms for logging "
+          f"({import_time / reference_time:.2f}, budget: {options.import_budget})")
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'import_ms': import_time,
+        'import_reference_ms': reference_time,
+        'undecorated_ns': baselines,
+        'overhead_ns': overheads,
+    }
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    failures = []
+    if import_time > reference_time * options.import_budget:
+        failures.append(f"Importing utilities takes {import_time / reference_time:.2f} times as long as importing "
+                        f"logging, more than its budget of {options.import_budget}")
+    if options.baseline:
+        with open(options.baseline) as file:
+            previous = json.load(file)['overhead_ns']
+        for case, (before, after) in regressions(overheads, previous, options.threshold, options.min_ns).items():
+            failures.append(f"{case}: overhead grew from {before:.0f}ns to {after:.0f}ns")
+    if failures:
+        sys.exit('\n'.join(['Performance regressions:', *failures]))
+
+
+if __name__ == '__main__':
+    main()
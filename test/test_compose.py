@@ -0,0 +1,144 @@
+"""
+Checks that ``Decorators.compose(a, b, c)(f)`` behaves like the stacked ``a(b(c(f)))``: same results, same
+exceptions and the same metrics. Run it with ``python -m pytest`` from the repository or the test folder.
+"""
+import sys
+sys.path.append("../src")
+sys.path.append("./src")
+import asyncio
+import logging
+
+import pytest
+
+from utilities import Decorators, log
+
+
+log.setLevel(logging.WARNING)
+
+
+def make_function():
+    """
+    Returns a new function (so that its metrics are kept apart) which records its calls and fails for negative numbers.
+    """
+    calls = []
+
+    def scaled(x, factor=2):
+        calls.append((x, factor))
+        if x < 0:
+            raise ValueError(f'negative: {x}')
+        return x * factor
+
+    scaled.calls = calls
+    return scaled
+
+
+def make_coroutine_function():
+    calls = []
+
+    async def scaled(x, factor=2):
+        calls.append((x, factor))
+        await asyncio.sleep(0)
+        if x < 0:
+            raise ValueError(f'negative: {x}')
+        return x * factor
+
+    scaled.calls = calls
+    return scaled
+
+
+DECORATOR_SETS = {
+    'instrumentation': lambda: (Decorators.run_time(histogram=True), Decorators.counter(log_calls=False),
+                                Decorators.show_args),
+    'checks': lambda: (Decorators.counter(log_calls=False), Decorators.accepted_argument_types(int, int),
+                       Decorators.container_non_empty),
+    'retry': lambda: (Decorators.counter(log_calls=False), Decorators.retry(3, 0), Decorators.show_args),
+    'memoize': lambda: (Decorators.counter(log_calls=False), Decorators.memoize, Decorators.run_time),
+    'validate': lambda: (Decorators.validate(values={'factor': (1, 2, 3)}), Decorators.counter(log_calls=False),
+                         Decorators.run_time(histogram=True)),
+}
+
+CALLS = [((1,), {}), ((2,), {'factor': 3}), ((1,), {}), ((-1,), {}), (('a',), {}), ((4,), {'factor': 5}), ((0,), {})]
+
+
+def stack(decorators, func):
+    for decorator in reversed(decorators):
+        func = decorator(func)
+    return func
+
+
+def outcome(call, *args, **kwargs):
+    try:
+        return 'result', call(*args, **kwargs)
+    except Exception as e:
+        return 'error', type(e), str(e)
+
+
+def metrics_of(wrapper):
+    """
+    Returns the metrics a wrapper exposes, found along the chain of stacked wrappers as well.
+    """
+    found = {}
+    while wrapper is not None:
+        for name in ('counter', 'histogram'):
+            metric = getattr(wrapper, name, None)
+            if metric is not None and name not in found:
+                found[name] = metric.summary()['count'] if name == 'histogram' else metric.value
+        cache_info = getattr(wrapper, 'cache_info', None)
+        if cache_info is not None and 'cache' not in found:
+            info = cache_info()
+            found['cache'] = info['hits'], info['misses']
+        wrapper = getattr(wrapper, '__wrapped__', None)
+    return found
+
+
+@pytest.mark.parametrize('name', DECORATOR_SETS)
+def test_compose_matches_stacked(name):
+    stacked_func, composed_func = make_function(), make_function()
+    stacked = stack(DECORATOR_SETS[name](), stacked_func)
+    composed = Decorators.compose(*DECORATOR_SETS[name]())(composed_func)
+
+    for args, kwargs in CALLS:
+        assert outcome(composed, *args, **kwargs) == outcome(stacked, *args, **kwargs), (args, kwargs)
+    assert composed_func.calls == stacked_func.calls
+    assert metrics_of(composed)['counter'] > 0
+    assert metrics_of(composed) == metrics_of(stacked)
+    assert composed.__name__ == stacked.__name__ == 'scaled'
+
+
+@pytest.mark.parametrize('name', DECORATOR_SETS)
+def test_compose_matches_stacked_coroutine_functions(name):
+    stacked_func, composed_func = make_coroutine_function(), make_coroutine_function()
+    stacked = stack(DECORATOR_SETS[name](), stacked_func)
+    composed = Decorators.compose(*DECORATOR_SETS[name]())(composed_func)
+
+    async def outcome_async(call, *args, **kwargs):
+        try:
+            return 'result', await call(*args, **kwargs)
+        except Exception as e:
+            return 'error', type(e), str(e)
+
+    for args, kwargs in CALLS:
+        assert asyncio.run(outcome_async(composed, *args, **kwargs)) == \
+            asyncio.run(outcome_async(stacked, *args, **kwargs)), (args, kwargs)
+    assert composed_func.calls == stacked_func.calls
+    assert metrics_of(composed)['counter'] > 0
+    assert metrics_of(composed) == metrics_of(stacked)
+
+
+def test_compose_applies_foreign_decorators_in_order():
+    order = []
+
+    def tagging(tag):
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                order.append(tag)
+                return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    stacked_func, composed_func = make_function(), make_function()
+    stacked = stack((tagging('outer'), Decorators.counter(log_calls=False), tagging('inner')), stacked_func)
+    composed = Decorators.compose(tagging('outer'), Decorators.counter(log_calls=False), tagging('inner'))(composed_func)
+
+    assert outcome(composed, 3) == outcome(stacked, 3)
+    assert order == ['outer', 'inner', 'outer', 'inner']
@@ -0,0 +1,73 @@
+"""
+Checks the argument checks generated by ``Decorators.validate``, in particular for ``*args`` and ``**kwargs`` whose
+annotations and valid values apply to each of their items. Run it with ``python -m pytest`` from the repository or the
+test folder.
+"""
+import sys
+sys.path.append("../src")
+sys.path.append("./src")
+
+import pytest
+
+from utilities import Decorators
+
+
+def test_var_positional_annotation_checks_each_item():
+    @Decorators.validate
+    def f(a: int, *args: int):
+        return args
+
+    assert f(1) == ()
+    assert f(1, 2, 3) == (2, 3)
+    with pytest.raises(TypeError, match=r'"args\[1\]"'):
+        f(1, 2, 'x')
+
+
+def test_var_keyword_annotation_checks_each_value():
+    @Decorators.validate
+    def g(**kw: str):
+        return kw
+
+    assert g() == {}
+    assert g(z='q', y='r') == {'z': 'q', 'y': 'r'}
+    with pytest.raises(TypeError, match='"y"'):
+        g(z='q', y=1)
+
+
+def test_values_of_var_parameters_apply_to_each_item():
+    @Decorators.validate(values={'args': (1, 2), 'kw': ('a', 'b')})
+    def h(*args, **kw):
+        return args, kw
+
+    assert h(1, 2, 1, x='a', y='b') == ((1, 2, 1), {'x': 'a', 'y': 'b'})
+    with pytest.raises(SyntaxError, match=r'"args\[2\]"'):
+        h(1, 2, 3)
+    with pytest.raises(SyntaxError, match='"y"'):
+        h(y='c')
+    with pytest.raises(SyntaxError):
+        h([1])
+
+
+def test_numeric_tower():
+    @Decorators.validate
+    def scaled(x: float, factor: complex = 1):
+        return x * factor
+
+    assert scaled(2) == 2
+    assert scaled(2.5, factor=2j) == 5j
+    with pytest.raises(TypeError):
+        scaled('2')
+    with pytest.raises(TypeError):
+        scaled(1, factor='2')
+
+
+def test_compose_checks_each_item():
+    @Decorators.compose(Decorators.counter(log_calls=False), Decorators.validate)
+    def f(a: int, *args: int, **kw: float):
+        return a, args, kw
+
+    assert f(1, 2, x=3) == (1, (2,), {'x': 3})
+    with pytest.raises(TypeError):
+        f(1, 2.5)
+    with pytest.raises(TypeError):
+        f(1, x='3')